@@ -5,8 +5,9 @@ Este módulo implementa a automação do navegador para interagir
 com o site de apostas esportivas.
 """
 from typing import Dict, Any, Optional, List, Tuple
-import time
+import base64
 import re
+import threading
 from loguru import logger
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -28,6 +29,173 @@ from ..config.settings import BROWSER_TYPE, HEADLESS
 from ..database.schemas import Bet
 
 
+# Qualidade das screenshots em JPEG (navegadores Chromium)
+SCREENSHOT_JPEG_QUALITY = 70
+
+# Intervalos de polling das esperas explícitas, em segundos (o padrão do Selenium é 0.5).
+# Condições que fazem mais de uma consulta ao navegador por polling usam o intervalo maior.
+WAIT_POLL_FREQUENCY = 0.1
+NOISY_WAIT_POLL_FREQUENCY = 0.25
+_WAIT_IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+# Expressão para extrair valores numéricos (odds, saldo) do texto da página
+_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+# Símbolos de moeda e espaços removidos antes da conversão direta para float.
+# A vírgula não é removida: "3,75" deve cair no regex (como antes), e não virar 375.
+_NUMBER_STRIP = str.maketrans("", "", "R$€£ \t\n\xa0")
+
+# Caminhos dos drivers já instalados, por tipo de navegador. Evita consultar
+# o webdriver-manager (e a rede) a cada nova sessão do navegador.
+_DRIVER_PATH_CACHE: Dict[str, str] = {}
+_DRIVER_PATH_LOCK = threading.Lock()
+
+_DRIVER_MANAGERS = {
+    "chrome": ChromeDriverManager,
+    "firefox": GeckoDriverManager,
+    "edge": EdgeChromiumDriverManager,
+}
+
+# Argumentos fixos do Chrome, montados uma única vez na importação do módulo
+_BASE_CHROME_ARGS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--window-size=1920,1080",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-features=TranslateUI,BackForwardCache",
+)
+
+# Preferências do Chrome: bloqueia o carregamento de imagens, que a automação não usa
+_CHROME_PREFS = {"profile.managed_default_content_settings.images": 2}
+
+# Alfabetos usados no translate() das buscas XPath sem distinção de maiúsculas
+_XPATH_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZÁÀÂÃÉÊÍÓÔÕÚÇ"
+_XPATH_LOWER = "abcdefghijklmnopqrstuvwxyzáàâãéêíóôõúç"
+
+
+def _parse_number(text: str) -> Optional[float]:
+    """
+    Extrai um valor numérico (odds, saldo) do texto de um elemento.
+    
+    Tenta primeiro a conversão direta após remover moeda e espaços
+    (caso comum: "3.75", "R$ 12.34") e recorre ao regex para textos mistos.
+    A conversão direta só é usada quando o texto restante é exatamente um
+    número no formato do regex, para que o resultado seja sempre o mesmo
+    (float() aceitaria também "1e3", "1_000" ou "inf").
+    
+    Args:
+        text: Texto do elemento.
+        
+    Returns:
+        float: Valor extraído ou None se não houver número no texto.
+    """
+    stripped = text.translate(_NUMBER_STRIP)
+    if _NUMBER_RE.fullmatch(stripped):
+        return float(stripped)
+    
+    match = _NUMBER_RE.search(text)
+    return float(match.group(1)) if match else None
+
+
+def _get_driver_path(browser_type: str) -> str:
+    """
+    Retorna o caminho do driver do navegador, instalando-o apenas na primeira vez.
+    
+    Args:
+        browser_type: Tipo de navegador (chrome, firefox, edge).
+        
+    Returns:
+        str: Caminho do executável do driver.
+    """
+    with _DRIVER_PATH_LOCK:
+        path = _DRIVER_PATH_CACHE.get(browser_type)
+        if path is None:
+            path = _DRIVER_MANAGERS[browser_type]().install()
+            _DRIVER_PATH_CACHE[browser_type] = path
+        return path
+
+
+def _build_chrome_options(headless: bool) -> ChromeOptions:
+    """
+    Cria as opções do Chrome a partir dos argumentos base.
+    
+    Args:
+        headless: Se True, executa o navegador em modo headless.
+        
+    Returns:
+        ChromeOptions: Opções prontas para iniciar o driver.
+    """
+    options = ChromeOptions()
+    for argument in _BASE_CHROME_ARGS:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", _CHROME_PREFS)
+    # Retorna do driver.get() no DOMContentLoaded; as esperas explícitas cuidam do resto
+    options.page_load_strategy = "eager"
+    if headless:
+        options.add_argument("--headless=new")
+    return options
+
+
+def _build_firefox_options(headless: bool) -> FirefoxOptions:
+    """
+    Cria as opções do Firefox.
+    
+    Args:
+        headless: Se True, executa o navegador em modo headless.
+        
+    Returns:
+        FirefoxOptions: Opções prontas para iniciar o driver.
+    """
+    options = FirefoxOptions()
+    options.set_preference("permissions.default.image", 2)
+    options.page_load_strategy = "eager"
+    if headless:
+        options.add_argument("--headless")
+    return options
+
+
+def _xpath_literal(value: str) -> str:
+    """
+    Converte um texto em literal XPath, tratando aspas simples e duplas.
+    
+    Args:
+        value: Texto a ser convertido.
+        
+    Returns:
+        str: Literal XPath equivalente.
+    """
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+def _contains_text_xpath(nodes: Tuple[Tuple[str, str], ...], text: str) -> str:
+    """
+    Monta um XPath que encontra, em uma única consulta, os elementos
+    (tag, classe) cujo texto contém o valor informado, sem distinção
+    entre maiúsculas e minúsculas.
+    
+    Args:
+        nodes: Pares (tag, classe CSS) aceitos.
+        text: Texto que deve estar contido no elemento.
+        
+    Returns:
+        str: Expressão XPath.
+    """
+    node_test = " or ".join(
+        f"self::{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+        for tag, css_class in nodes
+    )
+    return (
+        f"//*[{node_test}]"
+        f"[contains(translate(., '{_XPATH_UPPER}', '{_XPATH_LOWER}'), {_xpath_literal(text.lower())})]"
+    )
+
+
 class BrowserAutomation:
     """
     Classe para automação do navegador para interagir com o site de apostas.
@@ -36,6 +204,74 @@ class BrowserAutomation:
     # URL base do site de apostas
     BASE_URL = "https://bolsadeaposta.bet.br/dsbook/euro/sport/horseracing"
     
+    # Seletores usados na automação (pré-alocados para evitar recriar as tuplas)
+    _SEL_LOGIN_BUTTON = (By.CSS_SELECTOR, "button.login-button, a.login-link")
+    _SEL_LOGIN_FORM = (By.CSS_SELECTOR, "form.login-form, div.login-container")
+    _SEL_USERNAME_INPUT = (By.CSS_SELECTOR, "input[type='text'], input[name='username']")
+    _SEL_PASSWORD_INPUT = (By.CSS_SELECTOR, "input[type='password'], input[name='password']")
+    _SEL_SUBMIT_BUTTON = (By.CSS_SELECTOR, "button[type='submit'], input[type='submit']")
+    _SEL_LOGIN_ERROR = (By.CSS_SELECTOR, "div.login-error, span.error-message")
+    _SEL_LOGGED_IN = (By.CSS_SELECTOR, "div.user-info, span.username, button.logout")
+    _SEL_RACE_ITEMS = (By.CSS_SELECTOR, "div.race-item, a.race-link")
+    _SEL_RACE_DETAILS = (By.CSS_SELECTOR, "div.race-details, div.horses-list")
+    _SEL_HORSE_ITEMS = (By.CSS_SELECTOR, "div.horse-item, tr.horse-row")
+    _SEL_ODDS = (By.CSS_SELECTOR, "span.odds, div.odds")
+    _SEL_BET_SLIP = (By.CSS_SELECTOR, "div.bet-slip, div.betting-panel")
+    _SEL_STAKE_INPUT = (By.CSS_SELECTOR, "input.stake-input, input[type='number']")
+    _SEL_CONFIRM_BET = (By.CSS_SELECTOR, "button.place-bet, button.confirm-bet")
+    _SEL_BET_SUCCESS = (By.CSS_SELECTOR, "div.bet-success, div.confirmation-message")
+    _SEL_BET_ERROR = (By.CSS_SELECTOR, "div.bet-error, div.error-message")
+    _SEL_BALANCE = (By.CSS_SELECTOR, "span.balance, div.user-balance")
+    
+    # Script assíncrono que retorna quando o documento terminou de carregar e
+    # o DOM ficou sem mutações por `quietMs`, ou após `timeoutMs` (retornando false).
+    _DOM_IDLE_JS = """
+        const [quietMs, timeoutMs, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+        let finished = false;
+        let observer = null;
+        let quietTimer = null;
+        const finish = (idle) => {
+            if (finished) return;
+            finished = true;
+            clearTimeout(quietTimer);
+            clearTimeout(deadline);
+            if (observer) observer.disconnect();
+            done(idle);
+        };
+        const deadline = setTimeout(() => finish(false), timeoutMs);
+        const observe = () => {
+            quietTimer = setTimeout(() => finish(true), quietMs);
+            observer = new MutationObserver(() => {
+                clearTimeout(quietTimer);
+                quietTimer = setTimeout(() => finish(true), quietMs);
+            });
+            observer.observe(document, {childList: true, subtree: true, attributes: true});
+        };
+        if (document.readyState === "complete") {
+            observe();
+        } else {
+            window.addEventListener("load", observe, {once: true});
+        }
+    """
+    
+    # Tentativas de interação quando um elemento fica obsoleto (página re-renderizada)
+    _STALE_RETRIES = 2
+    
+    # Pares (tag, classe) equivalentes a _SEL_RACE_ITEMS para a busca XPath
+    _RACE_ITEM_NODES = (("div", "race-item"), ("a", "race-link"))
+    
+    # Script que filtra os cavalos pelo nome e lê as odds em uma única chamada ao navegador.
+    # Retorna uma lista de pares [elemento, texto das odds].
+    _FIND_HORSES_JS = """
+        const [itemSelector, oddsSelector, name] = arguments;
+        return Array.from(document.querySelectorAll(itemSelector))
+            .filter(el => el.innerText.toLowerCase().includes(name))
+            .map(el => {
+                const odds = el.querySelector(oddsSelector);
+                return [el, odds ? odds.innerText : ""];
+            });
+    """
+    
     def __init__(self, headless: Optional[bool] = None):
         """
         Inicializa a automação do navegador.
@@ -49,6 +285,10 @@ class BrowserAutomation:
         self.driver = None
         self.logged_in = False
         self.timeout = 30  # Timeout padrão em segundos
+        self._wait = None
+        self._noisy_wait = None
+        self._current_race = None
+        self._current_race_url = None
     
     def start(self) -> bool:
         """
@@ -59,27 +299,15 @@ class BrowserAutomation:
         """
         try:
             if self.browser_type == "chrome":
-                options = ChromeOptions()
-                if self.headless:
-                    options.add_argument("--headless")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--window-size=1920,1080")
-                
                 self.driver = webdriver.Chrome(
-                    service=Service(ChromeDriverManager().install()),
-                    options=options
+                    service=Service(_get_driver_path("chrome")),
+                    options=_build_chrome_options(self.headless)
                 )
             
             elif self.browser_type == "firefox":
-                options = FirefoxOptions()
-                if self.headless:
-                    options.add_argument("--headless")
-                
                 self.driver = webdriver.Firefox(
-                    service=Service(GeckoDriverManager().install()),
-                    options=options
+                    service=Service(_get_driver_path("firefox")),
+                    options=_build_firefox_options(self.headless)
                 )
             
             elif self.browser_type == "edge":
@@ -88,7 +316,7 @@ class BrowserAutomation:
                     options.add_argument("--headless")
                 
                 self.driver = webdriver.Edge(
-                    service=Service(EdgeChromiumDriverManager().install()),
+                    service=Service(_get_driver_path("edge")),
                     options=options
                 )
             
@@ -96,6 +324,10 @@ class BrowserAutomation:
                 logger.error(f"Tipo de navegador não suportado: {self.browser_type}")
                 return False
             
+            self._wait = self._build_wait(self.driver)
+            self._noisy_wait = self._build_wait(self.driver, NOISY_WAIT_POLL_FREQUENCY)
+            self.driver.set_script_timeout(self.timeout)
+            
             self.driver.maximize_window()
             logger.info(f"Navegador {self.browser_type} iniciado com sucesso.")
             return True
@@ -104,6 +336,25 @@ class BrowserAutomation:
             logger.error(f"Erro ao iniciar o navegador: {e}")
             return False
     
+    def _build_wait(self, root: Any, poll_frequency: float = WAIT_POLL_FREQUENCY, ignored_exceptions: Tuple[type, ...] = _WAIT_IGNORED_EXCEPTIONS) -> WebDriverWait:
+        """
+        Cria uma espera explícita com o polling e as exceções ignoradas padrão.
+        
+        Args:
+            root: Driver ou elemento a partir do qual as buscas são feitas.
+            poll_frequency: Intervalo entre as verificações, em segundos.
+            ignored_exceptions: Exceções ignoradas durante o polling.
+            
+        Returns:
+            WebDriverWait: Espera explícita configurada.
+        """
+        return WebDriverWait(
+            root,
+            self.timeout,
+            poll_frequency=poll_frequency,
+            ignored_exceptions=ignored_exceptions
+        )
+    
     def stop(self):
         """
         Para o navegador.
@@ -116,6 +367,10 @@ class BrowserAutomation:
                 logger.error(f"Erro ao fechar o navegador: {e}")
             
             self.driver = None
+            self._wait = None
+            self._noisy_wait = None
+            self._current_race = None
+            self._current_race_url = None
             self.logged_in = False
     
     def login(self, username: str, password: str) -> bool:
@@ -137,10 +392,8 @@ class BrowserAutomation:
             # Navega para a página inicial
             self.driver.get(self.BASE_URL)
             
-            # Aguarda a página carregar
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            # Aguarda a página carregar e o DOM estabilizar
+            self._wait_dom_idle()
             
             # Verifica se já está logado
             if self._is_logged_in():
@@ -149,38 +402,43 @@ class BrowserAutomation:
                 return True
             
             # Clica no botão de login
-            login_button = WebDriverWait(self.driver, self.timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.login-button, a.login-link"))
+            login_button = self._wait.until(
+                EC.element_to_be_clickable(self._SEL_LOGIN_BUTTON)
             )
             login_button.click()
             
             # Aguarda o formulário de login
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "form.login-form, div.login-container"))
+            self._wait.until(
+                EC.presence_of_element_located(self._SEL_LOGIN_FORM)
             )
             
             # Preenche o nome de usuário
-            username_input = WebDriverWait(self.driver, self.timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='text'], input[name='username']"))
+            username_input = self._wait.until(
+                EC.element_to_be_clickable(self._SEL_USERNAME_INPUT)
             )
             username_input.clear()
             username_input.send_keys(username)
             
             # Preenche a senha
-            password_input = WebDriverWait(self.driver, self.timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='password'], input[name='password']"))
+            password_input = self._wait.until(
+                EC.element_to_be_clickable(self._SEL_PASSWORD_INPUT)
             )
             password_input.clear()
             password_input.send_keys(password)
             
             # Clica no botão de submit
-            submit_button = WebDriverWait(self.driver, self.timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit'], input[type='submit']"))
+            submit_button = self._wait.until(
+                EC.element_to_be_clickable(self._SEL_SUBMIT_BUTTON)
             )
             submit_button.click()
             
-            # Aguarda o login ser concluído
-            time.sleep(3)
+            # Aguarda o login ser concluído (sucesso ou mensagem de erro)
+            try:
+                self._noisy_wait.until(
+                    lambda d: self._is_logged_in() or d.find_elements(*self._SEL_LOGIN_ERROR)
+                )
+            except TimeoutException:
+                logger.warning("Tempo esgotado aguardando a conclusão do login.")
             
             # Verifica se o login foi bem-sucedido
             if self._is_logged_in():
@@ -195,6 +453,32 @@ class BrowserAutomation:
             logger.error(f"Erro ao realizar login: {e}")
             return False
     
+    def _wait_dom_idle(self, quiet_ms: int = 100, timeout: float = 5) -> bool:
+        """
+        Aguarda o carregamento do documento e a estabilização do DOM.
+        
+        Deve ser chamado uma vez após cada navegação, em vez de pausas fixas.
+        Páginas que nunca param de mudar (odds ao vivo, por exemplo) não
+        bloqueiam a automação: a espera termina após `timeout` segundos e as
+        esperas explícitas de cada etapa continuam valendo.
+        
+        Args:
+            quiet_ms: Tempo sem mutações no DOM, em milissegundos, para considerá-lo estável.
+            timeout: Tempo máximo de espera, em segundos.
+            
+        Returns:
+            bool: True se o DOM estabilizou, False se o tempo máximo foi atingido.
+        """
+        try:
+            idle = self.driver.execute_async_script(self._DOM_IDLE_JS, quiet_ms, int(timeout * 1000))
+        except (TimeoutException, WebDriverException) as e:
+            logger.debug(f"Erro ao aguardar a estabilização do DOM: {e}")
+            return False
+        
+        if not idle:
+            logger.debug(f"DOM não estabilizou em {timeout}s; prosseguindo.")
+        return bool(idle)
+    
     def _is_logged_in(self) -> bool:
         """
         Verifica se o usuário está logado.
@@ -205,7 +489,7 @@ class BrowserAutomation:
         try:
             # Verifica a presença de elementos que indicam que o usuário está logado
             # Isso pode variar dependendo do site específico
-            logged_in_elements = self.driver.find_elements(By.CSS_SELECTOR, "div.user-info, span.username, button.logout")
+            logged_in_elements = self.driver.find_elements(*self._SEL_LOGGED_IN)
             
             return len(logged_in_elements) > 0
         
@@ -232,30 +516,44 @@ class BrowserAutomation:
             return False
         
         try:
-            # Navega para a página principal de corridas de cavalos
-            self.driver.get(self.BASE_URL)
+            # Já está na página desta corrida (apostas seguidas na mesma corrida)
+            if race_name == self._current_race and self.driver.current_url == self._current_race_url:
+                logger.debug(f"Já está na página da corrida: {race_name}")
+                return True
+            
+            self._current_race = None
+            self._current_race_url = None
             
-            # Aguarda a página carregar
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            # Navega para a página principal de corridas de cavalos, se ainda não estiver nela
+            if self.driver.current_url.rstrip("/") != self.BASE_URL:
+                self.driver.get(self.BASE_URL)
+                
+                # Aguarda a página carregar e o DOM estabilizar
+                self._wait_dom_idle()
+            
+            # Aguarda a lista de corridas
+            self._wait.until(
+                EC.presence_of_element_located(self._SEL_RACE_ITEMS)
             )
             
-            # Procura pela corrida na lista
-            race_elements = WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.race-item, a.race-link"))
+            # Procura pela corrida diretamente no navegador (uma única consulta)
+            race_elements = self.driver.find_elements(
+                By.XPATH, _contains_text_xpath(self._RACE_ITEM_NODES, race_name)
             )
             
-            for element in race_elements:
-                if race_name.lower() in element.text.lower():
-                    element.click()
-                    logger.info(f"Navegou para a corrida: {race_name}")
-                    
-                    # Aguarda a página da corrida carregar
-                    WebDriverWait(self.driver, self.timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.race-details, div.horses-list"))
-                    )
-                    
-                    return True
+            if race_elements:
+                race_elements[0].click()
+                logger.info(f"Navegou para a corrida: {race_name}")
+                
+                # Aguarda a página da corrida carregar
+                self._wait.until(
+                    EC.presence_of_element_located(self._SEL_RACE_DETAILS)
+                )
+                self._wait_dom_idle()
+                
+                self._current_race = race_name
+                self._current_race_url = self.driver.current_url
+                return True
             
             logger.error(f"Corrida não encontrada: {race_name}")
             return False
@@ -279,28 +577,27 @@ class BrowserAutomation:
             return None
         
         try:
-            # Procura por todos os elementos de cavalos na página
-            horse_elements = WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.horse-item, tr.horse-row"))
+            # Aguarda a lista de cavalos
+            self._wait.until(
+                EC.presence_of_element_located(self._SEL_HORSE_ITEMS)
+            )
+            
+            # Filtra os cavalos pelo nome e lê as odds em uma única chamada ao navegador
+            horse_matches = self.driver.execute_script(
+                self._FIND_HORSES_JS,
+                self._SEL_HORSE_ITEMS[1],
+                self._SEL_ODDS[1],
+                horse_name.lower()
             )
             
-            for element in horse_elements:
-                # Verifica se o nome do cavalo está presente no elemento
-                if horse_name.lower() in element.text.lower():
-                    # Tenta encontrar o elemento de odds
-                    try:
-                        odds_element = element.find_element(By.CSS_SELECTOR, "span.odds, div.odds")
-                        odds_text = odds_element.text.strip()
-                        
-                        # Extrai o valor numérico das odds
-                        odds_match = re.search(r"(\d+\.?\d*)", odds_text)
-                        if odds_match:
-                            odds = float(odds_match.group(1))
-                            logger.info(f"Cavalo encontrado: {horse_name} com odds {odds}")
-                            return (element, odds)
-                    
-                    except (NoSuchElementException, ValueError) as e:
-                        logger.warning(f"Erro ao extrair odds para o cavalo {horse_name}: {e}")
+            for element, odds_text in horse_matches:
+                # Extrai o valor numérico das odds
+                odds = _parse_number(odds_text)
+                if odds is not None:
+                    logger.info(f"Cavalo encontrado: {horse_name} com odds {odds}")
+                    return (element, odds)
+                
+                logger.warning(f"Erro ao extrair odds para o cavalo {horse_name}: '{odds_text}'")
             
             logger.error(f"Cavalo não encontrado: {horse_name}")
             return None
@@ -337,32 +634,45 @@ class BrowserAutomation:
             
             horse_element, current_odds = horse_result
             
-            # Clica no cavalo para selecioná-lo
-            horse_element.click()
-            
-            # Aguarda o painel de apostas aparecer
-            bet_slip = WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.bet-slip, div.betting-panel"))
-            )
-            
-            # Preenche o valor da stake
-            stake_input = WebDriverWait(bet_slip, self.timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input.stake-input, input[type='number']"))
-            )
-            stake_input.clear()
-            stake_input.send_keys(str(bet.stake))
-            
-            # Clica no botão de confirmar aposta
-            confirm_button = WebDriverWait(bet_slip, self.timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.place-bet, button.confirm-bet"))
-            )
-            confirm_button.click()
-            
-            # Aguarda a confirmação da aposta
-            time.sleep(2)
+            # Clica no cavalo para selecioná-lo. Se a lista foi re-renderizada
+            # depois da busca, o elemento fica obsoleto e o cavalo é buscado de novo.
+            for attempt in range(self._STALE_RETRIES):
+                try:
+                    horse_element.click()
+                    break
+                except StaleElementReferenceException:
+                    if attempt == self._STALE_RETRIES - 1:
+                        raise
+                    logger.warning(f"Elemento do cavalo {bet.horse_name} obsoleto; buscando novamente.")
+                    horse_result = self.find_horse(bet.horse_name)
+                    if not horse_result:
+                        return {"success": False, "error": f"Cavalo não encontrado: {bet.horse_name}"}
+                    horse_element, current_odds = horse_result
+            
+            # Preenche a stake e confirma, refazendo o preenchimento se o painel
+            # de apostas for re-renderizado no meio do processo
+            for attempt in range(self._STALE_RETRIES):
+                try:
+                    self._fill_bet_slip(bet.stake)
+                    break
+                except StaleElementReferenceException:
+                    if attempt == self._STALE_RETRIES - 1:
+                        raise
+                    logger.warning("Painel de apostas re-renderizado; preenchendo novamente.")
+            
+            # Aguarda a confirmação (ou o erro) da aposta
+            try:
+                self._noisy_wait.until(
+                    EC.any_of(
+                        EC.presence_of_element_located(self._SEL_BET_SUCCESS),
+                        EC.presence_of_element_located(self._SEL_BET_ERROR)
+                    )
+                )
+            except TimeoutException:
+                logger.warning("Tempo esgotado aguardando a confirmação da aposta.")
             
             # Verifica se a aposta foi confirmada
-            success_elements = self.driver.find_elements(By.CSS_SELECTOR, "div.bet-success, div.confirmation-message")
+            success_elements = self.driver.find_elements(*self._SEL_BET_SUCCESS)
             
             if success_elements:
                 logger.info(f"Aposta realizada com sucesso: {bet.horse_name} na corrida {bet.race}")
@@ -378,7 +688,7 @@ class BrowserAutomation:
                     }
                 }
             else:
-                error_elements = self.driver.find_elements(By.CSS_SELECTOR, "div.bet-error, div.error-message")
+                error_elements = self.driver.find_elements(*self._SEL_BET_ERROR)
                 error_message = error_elements[0].text if error_elements else "Erro desconhecido ao confirmar aposta"
                 
                 logger.error(f"Erro ao realizar aposta: {error_message}")
@@ -388,6 +698,37 @@ class BrowserAutomation:
             logger.error(f"Erro ao realizar aposta: {e}")
             return {"success": False, "error": str(e)}
     
+    def _fill_bet_slip(self, stake: float):
+        """
+        Preenche a stake no painel de apostas e clica em confirmar.
+        
+        Args:
+            stake: Valor da aposta.
+            
+        Raises:
+            StaleElementReferenceException: Se o painel for re-renderizado durante o preenchimento.
+        """
+        # Aguarda o painel de apostas aparecer
+        bet_slip = self._wait.until(
+            EC.presence_of_element_located(self._SEL_BET_SLIP)
+        )
+        
+        # Preenche o valor da stake. A espera a partir do painel não ignora
+        # StaleElementReferenceException: se o painel for re-renderizado, o erro
+        # chega logo a quem chamou (que tenta de novo), sem esperar o timeout
+        slip_wait = self._build_wait(bet_slip, ignored_exceptions=(NoSuchElementException,))
+        stake_input = slip_wait.until(
+            EC.element_to_be_clickable(self._SEL_STAKE_INPUT)
+        )
+        stake_input.clear()
+        stake_input.send_keys(str(stake))
+        
+        # Clica no botão de confirmar aposta
+        confirm_button = slip_wait.until(
+            EC.element_to_be_clickable(self._SEL_CONFIRM_BET)
+        )
+        confirm_button.click()
+    
     def check_balance(self) -> Optional[float]:
         """
         Verifica o saldo da conta.
@@ -405,16 +746,15 @@ class BrowserAutomation:
         
         try:
             # Procura pelo elemento que contém o saldo
-            balance_element = WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "span.balance, div.user-balance"))
+            balance_element = self._wait.until(
+                EC.presence_of_element_located(self._SEL_BALANCE)
             )
             
             balance_text = balance_element.text.strip()
             
             # Extrai o valor numérico do saldo
-            balance_match = re.search(r"(\d+\.?\d*)", balance_text)
-            if balance_match:
-                balance = float(balance_match.group(1))
+            balance = _parse_number(balance_text)
+            if balance is not None:
                 logger.info(f"Saldo atual: {balance}")
                 return balance
             
@@ -425,6 +765,36 @@ class BrowserAutomation:
             logger.error(f"Erro ao verificar saldo: {e}")
             return None
     
+    def get_screenshot_bytes(self) -> Optional[Tuple[bytes, str]]:
+        """
+        Captura uma screenshot da página atual e retorna os bytes da imagem,
+        sem gravá-la em disco.
+        
+        Em navegadores Chromium (Chrome, Edge) a imagem é gerada em JPEG
+        diretamente pelo DevTools Protocol, bem menor que o PNG padrão.
+        Nos demais navegadores é usado o PNG do WebDriver.
+        
+        Returns:
+            tuple: (bytes da imagem, extensão do arquivo) ou None em caso de erro.
+        """
+        if not self.driver:
+            logger.error("Navegador não iniciado.")
+            return None
+        
+        try:
+            if hasattr(self.driver, "execute_cdp_cmd"):
+                screenshot = self.driver.execute_cdp_cmd(
+                    "Page.captureScreenshot",
+                    {"format": "jpeg", "quality": SCREENSHOT_JPEG_QUALITY}
+                )
+                return base64.b64decode(screenshot["data"]), "jpg"
+            
+            return self.driver.get_screenshot_as_png(), "png"
+        
+        except Exception as e:
+            logger.error(f"Erro ao capturar screenshot: {e}")
+            return None
+    
     def take_screenshot(self, filename: str) -> bool:
         """
         Captura uma screenshot da página atual.
@@ -4,18 +4,35 @@ Módulo para gerenciamento de sessões do navegador.
 Este módulo implementa o gerenciamento de sessões do navegador,
 permitindo criar, reutilizar e encerrar sessões de automação.
 """
+import asyncio
 import os
-import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 
 from .automation import BrowserAutomation
 from ..config.settings import get_config
 from ..database.schemas import Bet
-from ..database.supabase_client import SupabaseClient
+from ..database.supabase_client import get_supabase_client
+
+
+def _write_bytes(path: str, data: bytes):
+    """
+    Grava bytes em um arquivo (executado no pool de I/O).
+    
+    Args:
+        path: Caminho do arquivo.
+        data: Conteúdo a ser gravado.
+    """
+    try:
+        with open(path, "wb") as f:
+            f.write(data)
+        logger.info(f"Screenshot salva em: {path}")
+    except OSError as e:
+        logger.error(f"Erro ao salvar screenshot em {path}: {e}")
 
 
 class BrowserManager:
@@ -28,21 +45,52 @@ class BrowserManager:
         Inicializa o gerenciador de navegador.
         """
         self.config = get_config()
-        self.browser = None
-        self.db_client = SupabaseClient()
+        self.browsers: List[BrowserAutomation] = []
+        self.db_client = get_supabase_client()
         self.bet_queue = queue.Queue()
-        self.processing_thread = None
-        self.running = False
+        self.processing_threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._stop_event.set()
+        self._io_pool: Optional[ThreadPoolExecutor] = None
         self.screenshots_dir = os.path.join(os.getcwd(), "screenshots")
         
         # Cria o diretório de screenshots se não existir
         if not os.path.exists(self.screenshots_dir):
             os.makedirs(self.screenshots_dir)
     
+    @property
+    def browser(self) -> Optional[BrowserAutomation]:
+        """
+        Retorna a primeira sessão do navegador (usada para consultas como o saldo).
+        
+        Returns:
+            BrowserAutomation: Sessão do navegador ou None se não houver sessões ativas.
+        """
+        return self.browsers[0] if self.browsers else None
+    
+    def _create_browser(self):
+        """
+        Cria uma sessão do navegador com a biblioteca de automação configurada
+        (BROWSER_BACKEND: selenium ou playwright).
+        
+        Returns:
+            BrowserAutomation ou PlaywrightAutomation: Sessão do navegador (não iniciada).
+        """
+        headless = self.config["browser"]["headless"]
+        
+        if self.config["browser"]["backend"] == "playwright":
+            from .playwright_automation import PlaywrightAutomation
+            return PlaywrightAutomation(headless=headless)
+        
+        return BrowserAutomation(headless=headless)
+    
     def start(self, username: str, password: str) -> bool:
         """
         Inicia o gerenciador de navegador.
         
+        Abre uma sessão do navegador por worker (configuração BROWSER_WORKERS),
+        todas consumindo a mesma fila de apostas.
+        
         Args:
             username: Nome de usuário para login.
             password: Senha para login.
@@ -50,59 +98,118 @@ class BrowserManager:
         Returns:
             bool: True se iniciado com sucesso, False caso contrário.
         """
+        n_workers = max(1, int(self.config["browser"].get("workers", 1)))
+        
         try:
-            # Cria uma nova instância do navegador
-            self.browser = BrowserAutomation(
-                headless=self.config["browser"]["headless"]
-            )
-            
-            # Inicia o navegador
-            if not self.browser.start():
-                logger.error("Falha ao iniciar o navegador.")
-                return False
+            for worker_id in range(n_workers):
+                # Cria uma nova instância do navegador
+                browser = self._create_browser()
+                
+                # Inicia o navegador
+                if not browser.start():
+                    logger.error(f"Falha ao iniciar o navegador (worker {worker_id}).")
+                    browser.stop()
+                    self._stop_browsers()
+                    return False
+                
+                # Realiza login
+                if not browser.login(username, password):
+                    logger.error(f"Falha ao realizar login (worker {worker_id}).")
+                    browser.stop()
+                    self._stop_browsers()
+                    return False
+                
+                self.browsers.append(browser)
             
-            # Realiza login
-            if not self.browser.login(username, password):
-                logger.error("Falha ao realizar login.")
-                self.browser.stop()
-                self.browser = None
-                return False
+            # Pool para gravar as screenshots em disco sem bloquear a fila
+            self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot-io")
             
-            # Inicia a thread de processamento
-            self.running = True
-            self.processing_thread = threading.Thread(
-                target=self._process_bet_queue,
-                daemon=True
-            )
-            self.processing_thread.start()
+            # Inicia uma thread de processamento por sessão
+            self._stop_event.clear()
+            for worker_id in range(n_workers):
+                thread = threading.Thread(
+                    target=self._process_bet_queue,
+                    args=(worker_id,),
+                    name=f"bet-worker-{worker_id}",
+                    daemon=True
+                )
+                thread.start()
+                self.processing_threads.append(thread)
             
-            logger.info("Gerenciador de navegador iniciado com sucesso.")
+            logger.info(f"Gerenciador de navegador iniciado com sucesso ({n_workers} worker(s)).")
             return True
         
         except Exception as e:
             logger.error(f"Erro ao iniciar o gerenciador de navegador: {e}")
-            if self.browser:
-                self.browser.stop()
-                self.browser = None
+            self._stop_browsers()
             return False
     
     def stop(self):
         """
         Para o gerenciador de navegador.
         """
-        self.running = False
+        self._stop_event.set()
+        
+        # Aguarda as threads de processamento terminarem
+        for thread in self.processing_threads:
+            if thread.is_alive():
+                thread.join(timeout=5)
+        self.processing_threads = []
         
-        # Aguarda a thread de processamento terminar
-        if self.processing_thread and self.processing_thread.is_alive():
-            self.processing_thread.join(timeout=5)
+        # Aguarda a gravação das screenshots pendentes
+        if self._io_pool:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
         
-        # Para o navegador
-        if self.browser:
-            self.browser.stop()
-            self.browser = None
+        # Para os navegadores
+        self._stop_browsers()
         
         logger.info("Gerenciador de navegador parado com sucesso.")
     
+    def _save_screenshot(self, browser: BrowserAutomation, path: str) -> Optional[str]:
+        """
+        Captura uma screenshot e agenda a gravação em disco no pool de I/O.
+        
+        Args:
+            browser: Sessão do navegador.
+            path: Caminho do arquivo de destino, sem extensão.
+            
+        Returns:
+            str: Caminho completo do arquivo (com a extensão do formato capturado)
+                 ou None se a captura falhar.
+        """
+        screenshot = browser.get_screenshot_bytes()
+        if screenshot is None:
+            return None
+        
+        data, extension = screenshot
+        path = f"{path}.{extension}"
+        
+        if self._io_pool:
+            self._io_pool.submit(_write_bytes, path, data)
+        else:
+            _write_bytes(path, data)
+        
+        return path
+    
+    @property
+    def running(self) -> bool:
+        """
+        Indica se os workers de processamento estão em execução.
+        
+        Returns:
+            bool: True se o gerenciador foi iniciado e ainda não foi parado.
+        """
+        return not self._stop_event.is_set()
+    
+    def _stop_browsers(self):
+        """
+        Fecha todas as sessões do navegador.
+        """
+        for browser in self.browsers:
+            browser.stop()
+        self.browsers = []
+    
     def add_bet_to_queue(self, bet: Bet):
         """
         Adiciona uma aposta à fila de processamento.
@@ -113,56 +220,62 @@ class BrowserManager:
         self.bet_queue.put(bet)
         logger.info(f"Aposta adicionada à fila: {bet.horse_name} - {bet.race}")
     
-    def _process_bet_queue(self):
+    def _process_bet_queue(self, worker_id: int = 0):
         """
         Processa a fila de apostas continuamente.
+        
+        Args:
+            worker_id: Índice da sessão do navegador usada por este worker.
         """
-        logger.info("Iniciando processador de fila de apostas")
+        logger.info(f"Iniciando processador de fila de apostas (worker {worker_id})")
+        
+        # Loop de eventos próprio do worker para executar as chamadas assíncronas do banco
+        loop = asyncio.new_event_loop()
         
-        while self.running:
+        while not self._stop_event.is_set():
             try:
-                # Tenta obter uma aposta da fila (com timeout para permitir verificação de self.running)
+                # Tenta obter uma aposta da fila (com timeout para permitir verificar a parada)
                 try:
                     bet = self.bet_queue.get(timeout=1)
                 except queue.Empty:
                     continue
                 
-                # Verifica se o navegador está ativo
-                if not self.browser:
+                # Verifica se o navegador deste worker está ativo
+                browser = self.browsers[worker_id] if worker_id < len(self.browsers) else None
+                if not browser:
                     logger.error("Navegador não está ativo. Não é possível processar a aposta.")
                     continue
                 
                 # Atualiza o status da aposta para "processing"
                 if bet.id:
-                    self.db_client.update_bet_status(bet.id, "processing")
+                    loop.run_until_complete(self.db_client.update_bet_status(bet.id, "processing"))
                 
-                # Captura screenshot antes da aposta
-                screenshot_before = os.path.join(
-                    self.screenshots_dir,
-                    f"bet_{bet.id or datetime.now().strftime('%Y%m%d%H%M%S')}_before.png"
-                )
-                self.browser.take_screenshot(screenshot_before)
+                # Captura screenshot antes da aposta (apenas em modo debug)
+                screenshot_before = None
+                if self.config["app"]["debug"]:
+                    screenshot_before = self._save_screenshot(browser, os.path.join(
+                        self.screenshots_dir,
+                        f"bet_{bet.id or datetime.now().strftime('%Y%m%d%H%M%S')}_before"
+                    ))
                 
                 # Realiza a aposta
-                result = self.browser.place_bet(bet)
+                result = browser.place_bet(bet)
                 
-                # Captura screenshot após a aposta
-                screenshot_after = os.path.join(
-                    self.screenshots_dir,
-                    f"bet_{bet.id or datetime.now().strftime('%Y%m%d%H%M%S')}_after.png"
-                )
-                self.browser.take_screenshot(screenshot_after)
+                # Captura screenshot após a aposta (apenas em caso de falha)
+                screenshot_after = None
+                if not result["success"]:
+                    screenshot_after = self._save_screenshot(browser, os.path.join(
+                        self.screenshots_dir,
+                        f"bet_{bet.id or datetime.now().strftime('%Y%m%d%H%M%S')}_after"
+                    ))
                 
-                # Atualiza o status da aposta no banco de dados
                 if bet.id:
                     if result["success"]:
-                        self.db_client.update_bet_status(bet.id, "completed", result)
                         logger.info(f"Aposta {bet.id} concluída com sucesso.")
                     else:
-                        self.db_client.update_bet_status(bet.id, "failed", result)
                         logger.error(f"Aposta {bet.id} falhou: {result.get('error', 'Erro desconhecido')}")
                 
-                # Registra a ação no log
+                # Atualiza o status da aposta e registra a ação no log
                 action_type = "bet_placed" if result["success"] else "bet_failed"
                 description = f"Aposta em {bet.horse_name} na corrida {bet.race}"
                 details = {
@@ -173,17 +286,26 @@ class BrowserManager:
                     }
                 }
                 
-                self.db_client.log_action(action_type, description, bet.id, details)
+                if bet.id:
+                    status = "completed" if result["success"] else "failed"
+                    loop.run_until_complete(self.db_client.process_bet_result(
+                        bet.id, status, result, action_type, description, details
+                    ))
+                else:
+                    loop.run_until_complete(self.db_client.log_action(action_type, description, None, details))
                 
                 # Marca como processado na fila
                 self.bet_queue.task_done()
                 
-                # Pequena pausa entre apostas
-                time.sleep(2)
+                # Pausa opcional entre apostas (BET_INTERVAL, padrão 0)
+                if self.config["browser"]["bet_interval"] > 0:
+                    self._stop_event.wait(self.config["browser"]["bet_interval"])
             
             except Exception as e:
                 logger.error(f"Erro ao processar aposta da fila: {e}")
-                time.sleep(5)  # Pausa maior em caso de erro
+                self._stop_event.wait(5)  # Pausa maior em caso de erro
+        
+        loop.close()
     
     def get_queue_size(self) -> int:
         """
@@ -201,7 +323,7 @@ class BrowserManager:
         Returns:
             bool: True se o navegador estiver ativo, False caso contrário.
         """
-        return self.browser is not None
+        return any(browser.driver is not None for browser in self.browsers)
     
     def check_balance(self) -> Optional[float]:
         """
@@ -0,0 +1,501 @@
+"""
+Módulo de automação do navegador usando o Playwright.
+
+Este módulo implementa uma alternativa ao BrowserAutomation (Selenium) para
+o fluxo de apostas. O Playwright se comunica com o navegador por uma conexão
+WebSocket persistente, em vez de uma requisição HTTP por comando do WebDriver.
+"""
+from typing import Dict, Any, Optional, Tuple
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+
+try:
+    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    logger.warning("Biblioteca Playwright não disponível.")
+    PLAYWRIGHT_AVAILABLE = False
+
+from .automation import BrowserAutomation, SCREENSHOT_JPEG_QUALITY, _parse_number
+from ..config.settings import BROWSER_TYPE, HEADLESS
+from ..database.schemas import Bet
+
+
+def _on_playwright_thread(method):
+    """
+    Executa o método na thread dona da sessão do Playwright.
+    
+    A API síncrona do Playwright só pode ser usada pela thread que a iniciou,
+    enquanto o BrowserManager chama a automação a partir de suas threads de
+    processamento (e a interface, a partir da thread principal).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if threading.get_ident() == self._thread_id:
+            return method(self, *args, **kwargs)
+        return self._executor.submit(method, self, *args, **kwargs).result()
+    
+    return wrapper
+
+
+# URLs de imagens bloqueadas no contexto do navegador
+_IMAGE_URL_PATTERN = "**/*.{png,jpg,jpeg,gif,webp,svg}"
+
+
+class PlaywrightAutomation:
+    """
+    Classe para automação do navegador com o Playwright.
+    Implementa a mesma interface que o BrowserAutomation para compatibilidade.
+    """
+    
+    BASE_URL = BrowserAutomation.BASE_URL
+    
+    # Tipo de navegador -> (engine do Playwright, canal do navegador instalado)
+    _BROWSERS = {
+        "chrome": ("chromium", "chrome"),
+        "edge": ("chromium", "msedge"),
+        "firefox": ("firefox", None),
+    }
+    
+    # Seletores CSS compartilhados com a automação via Selenium
+    _CSS_LOGIN_BUTTON = BrowserAutomation._SEL_LOGIN_BUTTON[1]
+    _CSS_LOGIN_FORM = BrowserAutomation._SEL_LOGIN_FORM[1]
+    _CSS_USERNAME_INPUT = BrowserAutomation._SEL_USERNAME_INPUT[1]
+    _CSS_PASSWORD_INPUT = BrowserAutomation._SEL_PASSWORD_INPUT[1]
+    _CSS_SUBMIT_BUTTON = BrowserAutomation._SEL_SUBMIT_BUTTON[1]
+    _CSS_LOGIN_ERROR = BrowserAutomation._SEL_LOGIN_ERROR[1]
+    _CSS_LOGGED_IN = BrowserAutomation._SEL_LOGGED_IN[1]
+    _CSS_RACE_ITEMS = BrowserAutomation._SEL_RACE_ITEMS[1]
+    _CSS_RACE_DETAILS = BrowserAutomation._SEL_RACE_DETAILS[1]
+    _CSS_HORSE_ITEMS = BrowserAutomation._SEL_HORSE_ITEMS[1]
+    _CSS_ODDS = BrowserAutomation._SEL_ODDS[1]
+    _CSS_BET_SLIP = BrowserAutomation._SEL_BET_SLIP[1]
+    _CSS_STAKE_INPUT = BrowserAutomation._SEL_STAKE_INPUT[1]
+    _CSS_CONFIRM_BET = BrowserAutomation._SEL_CONFIRM_BET[1]
+    _CSS_BET_SUCCESS = BrowserAutomation._SEL_BET_SUCCESS[1]
+    _CSS_BET_ERROR = BrowserAutomation._SEL_BET_ERROR[1]
+    _CSS_BALANCE = BrowserAutomation._SEL_BALANCE[1]
+    
+    def __init__(self, headless: Optional[bool] = None):
+        """
+        Inicializa a automação do navegador.
+        
+        Args:
+            headless: Se True, executa o navegador em modo headless (sem interface gráfica).
+                     Se None, usa a configuração global.
+        """
+        self.browser_type = BROWSER_TYPE.lower()
+        self.headless = headless if headless is not None else HEADLESS
+        self.driver = None  # Página ativa do Playwright (equivalente ao driver do Selenium)
+        self.logged_in = False
+        self.timeout = 30  # Timeout padrão em segundos
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._current_race = None
+        self._current_race_url = None
+        self._thread_id = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="playwright",
+            initializer=self._bind_thread
+        )
+    
+    def _bind_thread(self):
+        """
+        Registra a thread do executor como dona da sessão do Playwright.
+        """
+        self._thread_id = threading.get_ident()
+    
+    @_on_playwright_thread
+    def start(self) -> bool:
+        """
+        Inicia o navegador.
+        
+        Returns:
+            bool: True se o navegador foi iniciado com sucesso, False caso contrário.
+        """
+        if not PLAYWRIGHT_AVAILABLE:
+            logger.error("Biblioteca Playwright não disponível.")
+            return False
+        
+        if self.browser_type not in self._BROWSERS:
+            logger.error(f"Tipo de navegador não suportado: {self.browser_type}")
+            return False
+        
+        try:
+            engine, channel = self._BROWSERS[self.browser_type]
+            
+            self._playwright = sync_playwright().start()
+            launch_options = {"headless": self.headless}
+            if channel:
+                launch_options["channel"] = channel
+            self._browser = getattr(self._playwright, engine).launch(**launch_options)
+            
+            self._context = self._browser.new_context(viewport={"width": 1920, "height": 1080})
+            self._context.set_default_timeout(self.timeout * 1000)
+            
+            # Bloqueia o carregamento de imagens, que a automação não usa. Só as URLs
+            # de imagens passam pelo handler: as demais requisições seguem direto
+            self._context.route(_IMAGE_URL_PATTERN, lambda route: route.abort())
+            
+            self.driver = self._context.new_page()
+            logger.info(f"Navegador {self.browser_type} (Playwright) iniciado com sucesso.")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Erro ao iniciar o navegador: {e}")
+            self._close()
+            return False
+    
+    @_on_playwright_thread
+    def stop(self):
+        """
+        Para o navegador e encerra a thread da sessão do Playwright.
+        """
+        if self.driver:
+            self._close()
+            logger.info("Navegador fechado com sucesso.")
+        
+        # Sem wait: esta chamada roda na própria thread do executor
+        self._executor.shutdown(wait=False)
+    
+    def _close(self):
+        """
+        Encerra o contexto, o navegador e o Playwright, ignorando erros.
+        """
+        for resource, close in (
+            (self._context, "close"),
+            (self._browser, "close"),
+            (self._playwright, "stop"),
+        ):
+            if resource:
+                try:
+                    getattr(resource, close)()
+                except Exception as e:
+                    logger.error(f"Erro ao fechar o navegador: {e}")
+        
+        self._context = None
+        self._browser = None
+        self._playwright = None
+        self.driver = None
+        self._current_race = None
+        self._current_race_url = None
+        self.logged_in = False
+    
+    @_on_playwright_thread
+    def login(self, username: str, password: str) -> bool:
+        """
+        Realiza login no site de apostas.
+        
+        Args:
+            username: Nome de usuário.
+            password: Senha.
+        
+        Returns:
+            bool: True se o login foi bem-sucedido, False caso contrário.
+        """
+        if not self.driver:
+            if not self.start():
+                return False
+        
+        page = self.driver
+        
+        try:
+            # Navega para a página inicial
+            page.goto(self.BASE_URL, wait_until="domcontentloaded")
+            
+            # Verifica se já está logado
+            if self._is_logged_in():
+                logger.info("Usuário já está logado.")
+                self.logged_in = True
+                return True
+            
+            # Abre e preenche o formulário de login
+            page.locator(self._CSS_LOGIN_BUTTON).first.click()
+            page.locator(self._CSS_LOGIN_FORM).first.wait_for(state="attached")
+            page.locator(self._CSS_USERNAME_INPUT).first.fill(username)
+            page.locator(self._CSS_PASSWORD_INPUT).first.fill(password)
+            page.locator(self._CSS_SUBMIT_BUTTON).first.click()
+            
+            # Aguarda o login ser concluído (sucesso ou mensagem de erro)
+            try:
+                page.locator(f"{self._CSS_LOGGED_IN}, {self._CSS_LOGIN_ERROR}").first.wait_for(state="attached")
+            except PlaywrightTimeoutError:
+                logger.warning("Tempo esgotado aguardando a conclusão do login.")
+            
+            # Verifica se o login foi bem-sucedido
+            if self._is_logged_in():
+                logger.info("Login realizado com sucesso.")
+                self.logged_in = True
+                return True
+            else:
+                logger.error("Falha ao realizar login. Verifique as credenciais.")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Erro ao realizar login: {e}")
+            return False
+    
+    def _is_logged_in(self) -> bool:
+        """
+        Verifica se o usuário está logado.
+        
+        Returns:
+            bool: True se o usuário estiver logado, False caso contrário.
+        """
+        try:
+            return self.driver.locator(self._CSS_LOGGED_IN).count() > 0
+        
+        except Exception as e:
+            logger.error(f"Erro ao verificar status de login: {e}")
+            return False
+    
+    @_on_playwright_thread
+    def navigate_to_race(self, race_name: str) -> bool:
+        """
+        Navega para a página de uma corrida específica.
+        
+        Args:
+            race_name: Nome da corrida.
+        
+        Returns:
+            bool: True se a navegação foi bem-sucedida, False caso contrário.
+        """
+        if not self.driver:
+            logger.error("Navegador não iniciado.")
+            return False
+        
+        if not self.logged_in:
+            logger.error("Usuário não está logado.")
+            return False
+        
+        page = self.driver
+        
+        try:
+            # Já está na página desta corrida (apostas seguidas na mesma corrida)
+            if race_name == self._current_race and page.url == self._current_race_url:
+                logger.debug(f"Já está na página da corrida: {race_name}")
+                return True
+            
+            self._current_race = None
+            self._current_race_url = None
+            
+            # Navega para a página principal de corridas de cavalos, se ainda não estiver nela
+            if page.url.rstrip("/") != self.BASE_URL:
+                page.goto(self.BASE_URL, wait_until="domcontentloaded")
+            
+            # Aguarda a lista de corridas e filtra pelo nome (sem distinção de maiúsculas)
+            page.locator(self._CSS_RACE_ITEMS).first.wait_for(state="attached")
+            races = page.locator(self._CSS_RACE_ITEMS).filter(has_text=race_name)
+            
+            if races.count() > 0:
+                races.first.click()
+                logger.info(f"Navegou para a corrida: {race_name}")
+                
+                # Aguarda a página da corrida carregar
+                page.locator(self._CSS_RACE_DETAILS).first.wait_for(state="attached")
+                
+                self._current_race = race_name
+                self._current_race_url = page.url
+                return True
+            
+            logger.error(f"Corrida não encontrada: {race_name}")
+            return False
+        
+        except Exception as e:
+            logger.error(f"Erro ao navegar para a corrida: {e}")
+            return False
+    
+    @_on_playwright_thread
+    def find_horse(self, horse_name: str) -> Optional[Tuple[Any, float]]:
+        """
+        Encontra um cavalo na página atual.
+        
+        Args:
+            horse_name: Nome do cavalo.
+        
+        Returns:
+            tuple: (locator do cavalo, odds atual) ou None se não encontrado.
+        """
+        if not self.driver:
+            logger.error("Navegador não iniciado.")
+            return None
+        
+        page = self.driver
+        
+        try:
+            # Aguarda a lista de cavalos e filtra pelo nome (sem distinção de maiúsculas)
+            page.locator(self._CSS_HORSE_ITEMS).first.wait_for(state="attached")
+            horses = page.locator(self._CSS_HORSE_ITEMS).filter(has_text=horse_name)
+            
+            for index in range(horses.count()):
+                horse = horses.nth(index)
+                odds_locator = horse.locator(self._CSS_ODDS)
+                odds_text = odds_locator.first.inner_text() if odds_locator.count() else ""
+                
+                # Extrai o valor numérico das odds
+                odds = _parse_number(odds_text)
+                if odds is not None:
+                    logger.info(f"Cavalo encontrado: {horse_name} com odds {odds}")
+                    return (horse, odds)
+                
+                logger.warning(f"Erro ao extrair odds para o cavalo {horse_name}: '{odds_text}'")
+            
+            logger.error(f"Cavalo não encontrado: {horse_name}")
+            return None
+        
+        except Exception as e:
+            logger.error(f"Erro ao procurar cavalo: {e}")
+            return None
+    
+    @_on_playwright_thread
+    def place_bet(self, bet: Bet) -> Dict[str, Any]:
+        """
+        Realiza uma aposta.
+        
+        Args:
+            bet: Objeto Bet contendo os dados da aposta.
+        
+        Returns:
+            dict: Resultado da aposta com status e detalhes.
+        """
+        if not self.driver:
+            return {"success": False, "error": "Navegador não iniciado."}
+        
+        if not self.logged_in:
+            return {"success": False, "error": "Usuário não está logado."}
+        
+        page = self.driver
+        
+        try:
+            # Navega para a corrida
+            if not self.navigate_to_race(bet.race):
+                return {"success": False, "error": f"Corrida não encontrada: {bet.race}"}
+            
+            # Encontra o cavalo
+            horse_result = self.find_horse(bet.horse_name)
+            if not horse_result:
+                return {"success": False, "error": f"Cavalo não encontrado: {bet.horse_name}"}
+            
+            horse, current_odds = horse_result
+            
+            # Locators são resolvidos a cada ação, então uma nova renderização
+            # da lista não invalida o cavalo encontrado
+            horse.click()
+            
+            # Preenche a stake e confirma a aposta no painel de apostas
+            bet_slip = page.locator(self._CSS_BET_SLIP).first
+            bet_slip.locator(self._CSS_STAKE_INPUT).first.fill(str(bet.stake))
+            bet_slip.locator(self._CSS_CONFIRM_BET).first.click()
+            
+            # Aguarda a confirmação (ou o erro) da aposta
+            try:
+                page.locator(f"{self._CSS_BET_SUCCESS}, {self._CSS_BET_ERROR}").first.wait_for(state="attached")
+            except PlaywrightTimeoutError:
+                logger.warning("Tempo esgotado aguardando a confirmação da aposta.")
+            
+            # Verifica se a aposta foi confirmada
+            if page.locator(self._CSS_BET_SUCCESS).count() > 0:
+                logger.info(f"Aposta realizada com sucesso: {bet.horse_name} na corrida {bet.race}")
+                return {
+                    "success": True,
+                    "message": "Aposta realizada com sucesso",
+                    "details": {
+                        "horse": bet.horse_name,
+                        "race": bet.race,
+                        "odds": current_odds,
+                        "stake": bet.stake,
+                        "potential_return": current_odds * bet.stake
+                    }
+                }
+            else:
+                error_elements = page.locator(self._CSS_BET_ERROR)
+                error_message = (
+                    error_elements.first.inner_text() if error_elements.count()
+                    else "Erro desconhecido ao confirmar aposta"
+                )
+                
+                logger.error(f"Erro ao realizar aposta: {error_message}")
+                return {"success": False, "error": error_message}
+        
+        except Exception as e:
+            logger.error(f"Erro ao realizar aposta: {e}")
+            return {"success": False, "error": str(e)}
+    
+    @_on_playwright_thread
+    def check_balance(self) -> Optional[float]:
+        """
+        Verifica o saldo da conta.
+        
+        Returns:
+            float: Saldo atual ou None em caso de erro.
+        """
+        if not self.driver:
+            logger.error("Navegador não iniciado.")
+            return None
+        
+        if not self.logged_in:
+            logger.error("Usuário não está logado.")
+            return None
+        
+        try:
+            balance_text = self.driver.locator(self._CSS_BALANCE).first.inner_text().strip()
+            
+            # Extrai o valor numérico do saldo
+            balance = _parse_number(balance_text)
+            if balance is not None:
+                logger.info(f"Saldo atual: {balance}")
+                return balance
+            
+            logger.error(f"Não foi possível extrair o saldo do texto: {balance_text}")
+            return None
+        
+        except Exception as e:
+            logger.error(f"Erro ao verificar saldo: {e}")
+            return None
+    
+    @_on_playwright_thread
+    def get_screenshot_bytes(self) -> Optional[Tuple[bytes, str]]:
+        """
+        Captura uma screenshot da página atual em JPEG, sem gravá-la em disco.
+        
+        Returns:
+            tuple: (bytes da imagem, extensão do arquivo) ou None em caso de erro.
+        """
+        if not self.driver:
+            logger.error("Navegador não iniciado.")
+            return None
+        
+        try:
+            return self.driver.screenshot(type="jpeg", quality=SCREENSHOT_JPEG_QUALITY), "jpg"
+        
+        except Exception as e:
+            logger.error(f"Erro ao capturar screenshot: {e}")
+            return None
+    
+    @_on_playwright_thread
+    def take_screenshot(self, filename: str) -> bool:
+        """
+        Captura uma screenshot da página atual.
+        
+        Args:
+            filename: Nome do arquivo para salvar a screenshot.
+        
+        Returns:
+            bool: True se a screenshot foi capturada com sucesso, False caso contrário.
+        """
+        if not self.driver:
+            logger.error("Navegador não iniciado.")
+            return False
+        
+        try:
+            self.driver.screenshot(path=filename)
+            logger.info(f"Screenshot salva em: {filename}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Erro ao capturar screenshot: {e}")
+            return False
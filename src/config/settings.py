@@ -2,6 +2,8 @@
 Módulo de configuração para carregar variáveis de ambiente e configurações do sistema.
 """
 import os
+import sys
+from types import MappingProxyType
 from dotenv import load_dotenv
 from loguru import logger
 
@@ -25,13 +27,18 @@ MIN_STAKE = float(os.getenv("MIN_STAKE", 5))
 
 # Configurações do navegador
 BROWSER_TYPE = os.getenv("BROWSER_TYPE", "chrome")
+BROWSER_BACKEND = os.getenv("BROWSER_BACKEND", "selenium").lower()
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+BET_INTERVAL = float(os.getenv("BET_INTERVAL", 0))
+BROWSER_WORKERS = int(os.getenv("BROWSER_WORKERS", 1))
 
 # Configurações da aplicação
 DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
 # Configuração do logger
+# enqueue=True grava os logs em uma thread própria do loguru, sem bloquear
+# o processamento das apostas na escrita em disco.
 logger.remove()
 logger.add(
     "logs/app.log",
@@ -39,39 +46,48 @@ logger.add(
     retention="1 week",
     level=LOG_LEVEL,
     format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+    enqueue=True,
 )
 logger.add(
-    lambda msg: print(msg),
+    sys.stderr,
     level=LOG_LEVEL,
     format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+    enqueue=True,
 )
 
+# Configurações agrupadas, montadas uma única vez na importação do módulo.
+# MappingProxyType torna o dicionário somente leitura (seguro entre threads).
+_CONFIG = MappingProxyType({
+    "telegram": MappingProxyType({
+        "api_id": TELEGRAM_API_ID,
+        "api_hash": TELEGRAM_API_HASH,
+        "bot_token": TELEGRAM_BOT_TOKEN,
+        "group_id": TELEGRAM_GROUP_ID,
+    }),
+    "supabase": MappingProxyType({
+        "url": SUPABASE_URL,
+        "key": SUPABASE_KEY,
+    }),
+    "betting": MappingProxyType({
+        "default_stake": DEFAULT_STAKE,
+        "max_stake": MAX_STAKE,
+        "min_stake": MIN_STAKE,
+    }),
+    "browser": MappingProxyType({
+        "type": BROWSER_TYPE,
+        "backend": BROWSER_BACKEND,
+        "headless": HEADLESS,
+        "bet_interval": BET_INTERVAL,
+        "workers": BROWSER_WORKERS,
+    }),
+    "app": MappingProxyType({
+        "debug": DEBUG_MODE,
+        "log_level": LOG_LEVEL,
+    }),
+})
+
 def get_config():
     """
-    Retorna todas as configurações como um dicionário.
+    Retorna todas as configurações como um dicionário somente leitura.
     """
-    return {
-        "telegram": {
-            "api_id": TELEGRAM_API_ID,
-            "api_hash": TELEGRAM_API_HASH,
-            "bot_token": TELEGRAM_BOT_TOKEN,
-            "group_id": TELEGRAM_GROUP_ID,
-        },
-        "supabase": {
-            "url": SUPABASE_URL,
-            "key": SUPABASE_KEY,
-        },
-        "betting": {
-            "default_stake": DEFAULT_STAKE,
-            "max_stake": MAX_STAKE,
-            "min_stake": MIN_STAKE,
-        },
-        "browser": {
-            "type": BROWSER_TYPE,
-            "headless": HEADLESS,
-        },
-        "app": {
-            "debug": DEBUG_MODE,
-            "log_level": LOG_LEVEL,
-        },
-    }
+    return _CONFIG
@@ -4,13 +4,60 @@ Módulo para definição de esquemas de dados para o banco de dados.
 Este módulo contém classes e funções para definir a estrutura dos dados
 que serão armazenados no Supabase.
 """
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+import functools
 import json
+import sys
 
+try:
+    # Parser ISO 8601 em C, bem mais rápido que datetime.fromisoformat
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # A partir do Python 3.11 o fromisoformat aceita o sufixo "Z"
+        _parse_datetime = datetime.fromisoformat
+    else:
+        def _parse_datetime(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
-@dataclass
+try:
+    # Serialização JSON em Rust, bem mais rápida que o módulo json
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        # Saída compacta (sem espaços), igual à do orjson
+        return json.dumps(obj, separators=(",", ":")).encode()
+    
+    _json_loads = json.loads
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """
+    Converte uma string ISO 8601 para datetime, reaproveitando conversões já feitas.
+    
+    Timestamps repetidos (comuns em updated_at de um mesmo lote) são convertidos
+    uma única vez; datetime é imutável, então o resultado pode ser compartilhado.
+    """
+    return _parse_datetime(value)
+
+
+def clear_cache():
+    """
+    Limpa o cache de conversão de timestamps.
+    """
+    _parse_iso.cache_clear()
+
+
+# __slots__ nos dataclasses (parâmetro disponível a partir do Python 3.10)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Bet:
     """Esquema para armazenamento de apostas."""
     race: str
@@ -32,22 +79,25 @@ class Bet:
         Returns:
             dict: Dicionário com os dados da aposta.
         """
-        data = asdict(self)
-        
-        # Converte datetime para string ISO
-        if self.created_at:
-            data["created_at"] = self.created_at.isoformat()
-        
-        if self.updated_at:
-            data["updated_at"] = self.updated_at.isoformat()
+        # Monta o dicionário diretamente (asdict faz cópia profunda de cada campo)
+        data = {
+            "race": self.race,
+            "horse_name": self.horse_name,
+            "odds": self.odds,
+            "stake": self.stake,
+            "bet_type": self.bet_type,
+            "raw_message": self.raw_message,
+            "status": self.status,
+            # Converte datetime para string ISO
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else self.updated_at,
+            # result vai como objeto: a coluna JSONB é preenchida sem serialização dupla
+            "result": self.result
+        }
         
-        # Converte result para JSON string se não for None
-        if self.result:
-            data["result"] = json.dumps(self.result)
-        
-        # Remove id se for None
-        if self.id is None:
-            del data["id"]
+        # Inclui id apenas se estiver definido
+        if self.id is not None:
+            data["id"] = self.id
         
         return data
     
@@ -62,27 +112,51 @@ class Bet:
         Returns:
             Bet: Objeto Bet criado a partir do dicionário.
         """
-        # Cria uma cópia para não modificar o original
-        bet_data = data.copy()
+        # Monta o objeto diretamente, sem copiar nem modificar o dicionário
+        return cls.from_dicts([data])[0]
+    
+    @classmethod
+    def from_dicts(cls, rows: List[Dict[str, Any]]) -> List['Bet']:
+        """
+        Cria objetos Bet a partir de um lote de linhas retornadas pelo banco.
         
-        # Converte strings ISO para datetime
-        if "created_at" in bet_data and bet_data["created_at"]:
-            if isinstance(bet_data["created_at"], str):
-                bet_data["created_at"] = datetime.fromisoformat(bet_data["created_at"].replace("Z", "+00:00"))
+        Os dicionários não são copiados nem modificados: os campos são lidos
+        e convertidos diretamente para o construtor.
         
-        if "updated_at" in bet_data and bet_data["updated_at"]:
-            if isinstance(bet_data["updated_at"], str):
-                bet_data["updated_at"] = datetime.fromisoformat(bet_data["updated_at"].replace("Z", "+00:00"))
+        Args:
+            rows: Lista de dicionários com os dados das apostas.
+            
+        Returns:
+            list: Lista de objetos Bet.
+        """
+        parse_iso = _parse_iso
+        json_loads = _json_loads
+        bets = []
+        append = bets.append
         
-        # Converte result de JSON string para dicionário
-        if "result" in bet_data and bet_data["result"]:
-            if isinstance(bet_data["result"], str):
-                bet_data["result"] = json.loads(bet_data["result"])
+        for row in rows:
+            created_at = row.get("created_at")
+            updated_at = row.get("updated_at")
+            result = row.get("result")
+            
+            append(cls(
+                race=row["race"],
+                horse_name=row["horse_name"],
+                odds=row["odds"],
+                stake=row.get("stake"),
+                bet_type=row.get("bet_type", "win"),
+                raw_message=row.get("raw_message", ""),
+                status=row.get("status", "pending"),
+                created_at=parse_iso(created_at) if created_at and isinstance(created_at, str) else created_at,
+                updated_at=parse_iso(updated_at) if updated_at and isinstance(updated_at, str) else updated_at,
+                result=json_loads(result) if result and isinstance(result, str) else result,
+                id=row.get("id")
+            ))
         
-        return cls(**bet_data)
+        return bets
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LogEntry:
     """Esquema para armazenamento de logs."""
     action_type: str
@@ -99,19 +173,20 @@ class LogEntry:
         Returns:
             dict: Dicionário com os dados do log.
         """
-        data = asdict(self)
-        
-        # Converte datetime para string ISO
-        if self.created_at:
-            data["created_at"] = self.created_at.isoformat()
-        
-        # Converte details para JSON string se não for None
-        if self.details:
-            data["details"] = json.dumps(self.details)
+        # Monta o dicionário diretamente (asdict faz cópia profunda de cada campo)
+        data = {
+            "action_type": self.action_type,
+            "description": self.description,
+            # Converte datetime para string ISO
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+            "bet_id": self.bet_id,
+            # details vai como objeto: a coluna JSONB é preenchida sem serialização dupla
+            "details": self.details
+        }
         
-        # Remove id se for None
-        if self.id is None:
-            del data["id"]
+        # Inclui id apenas se estiver definido
+        if self.id is not None:
+            data["id"] = self.id
         
         return data
     
@@ -126,20 +201,42 @@ class LogEntry:
         Returns:
             LogEntry: Objeto LogEntry criado a partir do dicionário.
         """
-        # Cria uma cópia para não modificar o original
-        log_data = data.copy()
+        # Monta o objeto diretamente, sem copiar nem modificar o dicionário
+        return cls.from_dicts([data])[0]
+    
+    @classmethod
+    def from_dicts(cls, rows: List[Dict[str, Any]]) -> List['LogEntry']:
+        """
+        Cria objetos LogEntry a partir de um lote de linhas retornadas pelo banco.
         
-        # Converte string ISO para datetime
-        if "created_at" in log_data and log_data["created_at"]:
-            if isinstance(log_data["created_at"], str):
-                log_data["created_at"] = datetime.fromisoformat(log_data["created_at"].replace("Z", "+00:00"))
+        Os dicionários não são copiados nem modificados: os campos são lidos
+        e convertidos diretamente para o construtor.
         
-        # Converte details de JSON string para dicionário
-        if "details" in log_data and log_data["details"]:
-            if isinstance(log_data["details"], str):
-                log_data["details"] = json.loads(log_data["details"])
+        Args:
+            rows: Lista de dicionários com os dados dos logs.
+            
+        Returns:
+            list: Lista de objetos LogEntry.
+        """
+        parse_iso = _parse_iso
+        json_loads = _json_loads
+        logs = []
+        append = logs.append
         
-        return cls(**log_data)
+        for row in rows:
+            created_at = row.get("created_at")
+            details = row.get("details")
+            
+            append(cls(
+                action_type=row["action_type"],
+                description=row["description"],
+                created_at=parse_iso(created_at) if created_at and isinstance(created_at, str) else created_at,
+                bet_id=row.get("bet_id"),
+                details=json_loads(details) if details and isinstance(details, str) else details,
+                id=row.get("id")
+            ))
+        
+        return logs
 
 
 # Definição da estrutura das tabelas no Supabase
@@ -208,9 +305,68 @@ def get_create_tables_sql() -> str:
     -- Índices para melhorar a performance
     CREATE INDEX IF NOT EXISTS idx_bets_status ON bets(status);
     CREATE INDEX IF NOT EXISTS idx_bets_created_at ON bets(created_at);
+    CREATE INDEX IF NOT EXISTS idx_bets_pending_created ON bets(created_at) WHERE status = 'pending';
     CREATE INDEX IF NOT EXISTS idx_logs_action_type ON logs(action_type);
     CREATE INDEX IF NOT EXISTS idx_logs_created_at ON logs(created_at);
     CREATE INDEX IF NOT EXISTS idx_logs_bet_id ON logs(bet_id);
+    
+    -- Atualiza o resultado de uma aposta e registra o log em uma única chamada (transação)
+    CREATE OR REPLACE FUNCTION process_bet_result(
+        p_bet_id UUID,
+        p_status TEXT,
+        p_result JSONB,
+        p_action_type TEXT,
+        p_description TEXT,
+        p_details JSONB
+    ) RETURNS VOID AS $$
+    BEGIN
+        UPDATE bets
+        SET status = p_status,
+            result = COALESCE(p_result, result),
+            updated_at = NOW()
+        WHERE id = p_bet_id;
+        
+        INSERT INTO logs (action_type, description, bet_id, details)
+        VALUES (p_action_type, p_description, p_bet_id, p_details);
+    END;
+    $$ LANGUAGE plpgsql;
+    
+    -- Salva uma aposta e registra o log em uma única chamada (transação)
+    CREATE OR REPLACE FUNCTION save_bet_with_log(
+        p_bet JSONB,
+        p_action_type TEXT,
+        p_description TEXT,
+        p_details JSONB
+    ) RETURNS SETOF bets AS $$
+    DECLARE
+        v_bet bets;
+    BEGIN
+        INSERT INTO bets (race, horse_name, odds, stake, bet_type, raw_message, status, result, created_at)
+        VALUES (
+            p_bet->>'race',
+            p_bet->>'horse_name',
+            (p_bet->>'odds')::NUMERIC,
+            (p_bet->>'stake')::NUMERIC,
+            COALESCE(p_bet->>'bet_type', 'win'),
+            p_bet->>'raw_message',
+            COALESCE(p_bet->>'status', 'pending'),
+            NULLIF(p_bet->'result', 'null'::JSONB),
+            COALESCE((p_bet->>'created_at')::TIMESTAMPTZ, NOW())
+        )
+        RETURNING * INTO v_bet;
+        
+        INSERT INTO logs (action_type, description, bet_id, details)
+        VALUES (p_action_type, p_description, v_bet.id, p_details);
+        
+        RETURN NEXT v_bet;
+    END;
+    $$ LANGUAGE plpgsql;
+    
+    -- Contagem de apostas por status em uma única consulta
+    CREATE OR REPLACE FUNCTION bet_status_counts()
+    RETURNS TABLE(status TEXT, cnt BIGINT) AS $$
+        SELECT status, COUNT(*) FROM bets GROUP BY status;
+    $$ LANGUAGE sql STABLE;
     """
     
     return sql
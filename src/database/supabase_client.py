@@ -6,26 +6,166 @@ apostas, registrar logs e gerenciar a fila de apostas.
 """
 import os
 import json
-from datetime import datetime
+import mmap
+import time
+import functools
+import itertools
+import queue
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from loguru import logger
 
 try:
+    import httpx
     from supabase import create_client, Client
+    try:
+        from supabase.lib.client_options import SyncClientOptions as ClientOptions
+    except ImportError:
+        from supabase.lib.client_options import ClientOptions
+    from postgrest.types import ReturnMethod
     SUPABASE_AVAILABLE = True
 except ImportError:
     logger.warning("Biblioteca Supabase não disponível. Usando armazenamento local.")
     SUPABASE_AVAILABLE = False
 
 from ..config.settings import SUPABASE_URL, SUPABASE_KEY
+from .schemas import _json_dumps, _json_loads
 import os
 import json
 
+_UTC = timezone.utc
+
+# Colunas usadas pelos workers ao processar apostas pendentes (raw_message e result ficam de fora)
+_PENDING_BET_COLUMNS = "id,race,horse_name,odds,stake,bet_type,status,created_at"
+
+# Contagem inicial de apostas por status (status sem apostas não aparecem no GROUP BY)
+_EMPTY_STATUS_COUNTS = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
+
+# Armazenamento local: marcador dos registros de alteração de status e
+# número de alterações acumuladas antes de compactar o arquivo de apostas
+_PATCH_KEY = "_patch"
+_COMPACT_THRESHOLD = 1000
+
+# Tamanho máximo do arquivo de logs local; ao ser atingido, os logs mais antigos
+# são descartados e apenas a metade mais recente do limite é mantida
+_LOG_FILE_MAX_BYTES = 8 * 1024 * 1024
+
+# Janela (s) em que gravações próximas compartilham a mesma sincronização com o disco
+_SYNC_WINDOW = 0.005
+
+# Tempo (s) durante o qual as consultas de leitura do SupabaseClient são reaproveitadas;
+# as apostas pendentes alimentam a fila do navegador e usam um tempo menor
+_MEMO_TTL = 2.0
+_PENDING_MEMO_TTL = 0.5
+
+# Agrupamento das inserções de log: até N registros ou o intervalo (s), o que vier primeiro
+_LOG_BATCH_SIZE = 100
+_LOG_FLUSH_INTERVAL = 0.25
+
+# Tempo máximo (s) de espera pela gravação dos logs enfileirados no encerramento
+_LOG_FLUSH_TIMEOUT = 10.0
+
+# Códigos de erro do PostgREST/PostgreSQL para uma função RPC inexistente no banco
+_MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
+
+def _is_missing_function(error: Exception) -> bool:
+    """
+    Verifica se o erro de uma chamada RPC indica que a função não existe no banco.
+    
+    Args:
+        error: Exceção lançada pela chamada.
+    
+    Returns:
+        bool: True se a função não existe, False para os demais erros.
+    """
+    return getattr(error, "code", None) in _MISSING_FUNCTION_CODES
+
+
+def _utcnow_iso(timestamp: Optional[float] = None) -> str:
+    """
+    Retorna o horário atual (UTC) como string ISO 8601.
+    
+    Args:
+        timestamp: Horário (time.time()) já obtido pelo chamador, para que o mesmo
+            instante seja usado em todos os campos do registro (opcional).
+    
+    Returns:
+        str: Timestamp atual no formato ISO 8601 com fuso horário.
+    """
+    return datetime.fromtimestamp(time.time() if timestamp is None else timestamp, _UTC).isoformat()
+
+
+# Sequência que desempata IDs locais gerados no mesmo instante
+_LOCAL_ID_SEQUENCE = itertools.count()
+
+
+def _local_id(timestamp_ns: Optional[int] = None) -> str:
+    """
+    Gera um ID único para um registro do armazenamento local.
+    
+    O horário em nanossegundos mantém os IDs em ordem de criação e a sequência
+    garante que registros gravados no mesmo instante não recebam o mesmo ID.
+    
+    Args:
+        timestamp_ns: Horário (time.time_ns()) já obtido pelo chamador (opcional).
+    
+    Returns:
+        str: ID no formato local_<nanossegundos>_<sequência>.
+    """
+    if timestamp_ns is None:
+        timestamp_ns = time.time_ns()
+    return f"local_{timestamp_ns}_{next(_LOCAL_ID_SEQUENCE)}"
+
+
+# Conexões HTTP mantidas abertas entre as consultas ao Supabase: o intervalo de
+# atualização da interface é maior que o keep-alive padrão do httpx (5 s)
+_HTTP_KEEPALIVE_CONNECTIONS = 20
+_HTTP_KEEPALIVE_EXPIRY = 60
+
+
+@functools.lru_cache(maxsize=1)
+def _create_client(url: str, key: str) -> "Client":
+    """
+    Cria o cliente do Supabase com um pool de conexões HTTP persistentes.
+    
+    As credenciais são fixas no processo: um único cliente (e pool de conexões)
+    é suficiente e compartilhado por todas as chamadas.
+    
+    Args:
+        url: URL do projeto no Supabase.
+        key: Chave de acesso do Supabase.
+    
+    Returns:
+        Client: Cliente do Supabase.
+    """
+    http_client = httpx.Client(limits=httpx.Limits(
+        max_keepalive_connections=_HTTP_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY
+    ))
+    
+    try:
+        options = ClientOptions(httpx_client=http_client)
+    except TypeError:
+        # Versões do supabase-py sem suporte a um cliente HTTP próprio
+        http_client.close()
+        return create_client(url, key)
+    
+    return create_client(url, key, options=options)
+
 
 class LocalStorageClient:
     """
     Cliente para armazenamento local quando o Supabase não está disponível.
     Implementa a mesma interface que o SupabaseClient para compatibilidade.
+    
+    Apostas e logs são gravados em arquivos JSON Lines (um registro por linha)
+    apenas com acréscimos: uma atualização de status é gravada como um registro
+    de alteração ("patch") e aplicada sobre a aposta original na leitura.
     """
     
     def __init__(self):
@@ -33,22 +173,414 @@ class LocalStorageClient:
         Inicializa o cliente de armazenamento local.
         """
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
-        self.bets_file = os.path.join(self.data_dir, "bets.json")
-        self.logs_file = os.path.join(self.data_dir, "logs.json")
+        self.bets_file = os.path.join(self.data_dir, "bets.jsonl")
+        self.logs_file = os.path.join(self.data_dir, "logs.jsonl")
+        
+        # Os arquivos são preparados no primeiro acesso (ver _ensure_files)
+        self._files_ready = False
+        self._logs_size = 0
+        
+        # Os arquivos são acessados por várias threads (workers do navegador, gravação de logs)
+        self._lock = threading.Lock()
+        
+        # ID da aposta -> posição da linha original no arquivo (carregado sob demanda)
+        self._bet_offsets = None
+        self._patch_count = 0
+        
+        # Status atual de cada aposta, contagem por status e apostas pendentes
+        # (ID -> dados da aposta), mantidos junto com o índice
+        self._bet_statuses = {}
+        self._status_counts = Counter()
+        self._pending_bets = {}
+        
+        # Sincronização com o disco em grupo (uma chamada de fsync por janela de gravações)
+        self._sync_queue = queue.Queue()
+        self._sync_thread = None
+        self._sync_thread_lock = threading.Lock()
+        
+        logger.info("Cliente de armazenamento local inicializado com sucesso.")
+    
+    def _ensure_files(self):
+        """
+        Prepara o diretório e os arquivos de dados no primeiro acesso (chamado com a trava adquirida).
+        
+        Criar o cliente não toca o disco: o custo fica para a primeira leitura
+        ou gravação, e só é pago se o armazenamento local chegar a ser usado.
+        """
+        if self._files_ready:
+            return
         
         # Cria o diretório de dados se não existir
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # Converte os arquivos do formato anterior (array JSON), se existirem
+        self._migrate_legacy_file(os.path.join(self.data_dir, "bets.json"), self.bets_file)
+        self._migrate_legacy_file(os.path.join(self.data_dir, "logs.json"), self.logs_file)
+        
         # Inicializa os arquivos se não existirem
-        if not os.path.exists(self.bets_file):
-            with open(self.bets_file, 'w') as f:
-                json.dump([], f)
+        for path in (self.bets_file, self.logs_file):
+            if not os.path.exists(path):
+                open(path, 'ab').close()
         
-        if not os.path.exists(self.logs_file):
-            with open(self.logs_file, 'w') as f:
-                json.dump([], f)
+        self._logs_size = os.path.getsize(self.logs_file)
+        self._files_ready = True
+    
+    def _migrate_legacy_file(self, legacy_path: str, path: str):
+        """
+        Converte um arquivo no formato anterior (array JSON) para JSON Lines.
         
-        logger.info("Cliente de armazenamento local inicializado com sucesso.")
+        Args:
+            legacy_path: Caminho do arquivo no formato anterior.
+            path: Caminho do arquivo JSON Lines.
+        """
+        if os.path.exists(path) or not os.path.exists(legacy_path):
+            return
+        
+        with open(legacy_path, 'rb') as f:
+            records = _json_loads(f.read())
+        
+        self._write_records(path, records)
+        logger.info(f"Arquivo {legacy_path} convertido para {path}")
+    
+    @staticmethod
+    def _write_records(path: str, records: List[Dict[str, Any]]):
+        """
+        Reescreve um arquivo JSON Lines por completo (usado na conversão e na compactação).
+        
+        Args:
+            path: Caminho do arquivo.
+            records: Registros a serem gravados.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(_json_dumps(record) + b"\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    @staticmethod
+    def _append_records(path: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Acrescenta registros ao final de um arquivo JSON Lines, em uma única escrita.
+        
+        Args:
+            path: Caminho do arquivo.
+            records: Registros a serem acrescentados.
+        
+        Returns:
+            int: Posição no arquivo em que o primeiro registro foi gravado.
+        """
+        with open(path, 'ab') as f:
+            offset = f.tell()
+            f.write(b"".join(_json_dumps(record) + b"\n" for record in records))
+        return offset
+    
+    @staticmethod
+    async def _run_io(function):
+        """
+        Executa uma operação de arquivo em uma thread do pool padrão.
+        
+        A leitura e a escrita dos arquivos (e a espera pelo lock) não bloqueiam
+        o event loop, que continua atendendo as demais tarefas.
+        
+        Args:
+            function: Função sem argumentos que realiza a operação.
+        
+        Returns:
+            Valor retornado pela função.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, function)
+    
+    async def _sync(self, path: str):
+        """
+        Aguarda a gravação em disco (fsync) de um arquivo já escrito.
+        
+        As solicitações que chegam dentro da mesma janela são atendidas por uma
+        única sincronização, feita em uma thread em segundo plano.
+        
+        Args:
+            path: Caminho do arquivo.
+        """
+        # _sync é chamado de várias threads: a thread de sincronização é iniciada uma única vez
+        with self._sync_thread_lock:
+            if not self._sync_thread:
+                self._sync_thread = threading.Thread(target=self._sync_worker, daemon=True)
+                self._sync_thread.start()
+        
+        future = Future()
+        self._sync_queue.put((path, future))
+        await asyncio.wrap_future(future)
+    
+    def _sync_worker(self):
+        """
+        Atende as solicitações de sincronização em grupo.
+        """
+        while True:
+            # Aguarda a primeira solicitação e agrupa as que chegarem dentro da janela
+            requests = [self._sync_queue.get()]
+            deadline = time.monotonic() + _SYNC_WINDOW
+            
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    requests.append(self._sync_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            errors = {}
+            for path in {path for path, _ in requests}:
+                try:
+                    fd = os.open(path, os.O_RDWR)
+                    try:
+                        # fdatasync não existe em todas as plataformas (ex.: Windows)
+                        getattr(os, "fdatasync", os.fsync)(fd)
+                    finally:
+                        os.close(fd)
+                except OSError as e:
+                    errors[path] = e
+            
+            for path, future in requests:
+                if path in errors:
+                    future.set_exception(errors[path])
+                else:
+                    future.set_result(None)
+    
+    def _append_log_records(self, records: List[Dict[str, Any]]):
+        """
+        Acrescenta logs ao arquivo, descartando os mais antigos se o limite de tamanho for atingido.
+        
+        Args:
+            records: Logs a serem acrescentados.
+        """
+        self._ensure_files()
+        
+        data = b"".join(_json_dumps(record) + b"\n" for record in records)
+        
+        if self._logs_size + len(data) <= _LOG_FILE_MAX_BYTES or self._logs_size == 0:
+            self._append_records(self.logs_file, records)
+            self._logs_size += len(data)
+            return
+        
+        # Mantém apenas as linhas mais recentes (a partir da primeira quebra de linha
+        # dentro da metade final do limite) e grava o resultado de uma só vez
+        keep = _LOG_FILE_MAX_BYTES // 2
+        with open(self.logs_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = mm.find(b"\n", max(len(mm) - keep, 0)) + 1 if len(mm) > keep else 0
+            content = mm[start:] + data
+        
+        tmp_path = f"{self.logs_file}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.logs_file)
+        
+        self._logs_size = len(content)
+        logger.info(f"Arquivo de logs local atingiu o limite de tamanho; {start} bytes de logs antigos descartados")
+    
+    @staticmethod
+    def _iter_lines(path: str):
+        """
+        Percorre as linhas de um arquivo JSON Lines mapeado em memória.
+        
+        O arquivo é lido direto do cache de páginas do sistema, sem ser
+        carregado por inteiro em um buffer do processo.
+        
+        Args:
+            path: Caminho do arquivo.
+        
+        Yields:
+            tuple: Posição da linha no arquivo e o conteúdo da linha (bytes).
+        """
+        with open(path, 'rb') as f:
+            # Arquivos vazios não podem ser mapeados
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Leitura sequencial: permite ao sistema antecipar as próximas páginas
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                
+                offset = 0
+                for line in iter(mm.readline, b""):
+                    if line.strip():
+                        yield offset, line
+                    offset += len(line)
+    
+    @staticmethod
+    def _read_last_records(path: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Lê os últimos registros de um arquivo JSON Lines, do fim para o início.
+        
+        Args:
+            path: Caminho do arquivo.
+            limit: Número máximo de registros a serem lidos.
+        
+        Returns:
+            list: Registros do arquivo, dos mais recentes para os mais antigos.
+        """
+        records = []
+        
+        with open(path, 'rb') as f:
+            # Arquivos vazios não podem ser mapeados
+            if os.fstat(f.fileno()).st_size == 0:
+                return records
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = len(mm)
+                while end > 0 and len(records) < limit:
+                    # Início da linha que termina em "end" (ignorando a própria quebra de linha)
+                    start = mm.rfind(b"\n", 0, end - 1) + 1
+                    line = mm[start:end]
+                    if line.strip():
+                        records.append(_json_loads(line))
+                    end = start
+        
+        return records
+    
+    @classmethod
+    def _read_records(cls, path: str) -> List[Dict[str, Any]]:
+        """
+        Lê todos os registros de um arquivo JSON Lines.
+        
+        Args:
+            path: Caminho do arquivo.
+        
+        Returns:
+            list: Registros do arquivo, na ordem em que foram gravados.
+        """
+        return [_json_loads(line) for _, line in cls._iter_lines(path)]
+    
+    def _get_bet_offsets(self) -> Dict[str, int]:
+        """
+        Obtém o índice de apostas (ID -> posição no arquivo), construindo-o na primeira chamada.
+        
+        Returns:
+            dict: Posição da linha original de cada aposta.
+        """
+        if self._bet_offsets is None:
+            self._ensure_files()
+            
+            offsets = {}
+            bets = {}
+            patches = 0
+            
+            for offset, line in self._iter_lines(self.bets_file):
+                record = _json_loads(line)
+                if record.pop(_PATCH_KEY, False):
+                    patches += 1
+                    bet = bets.get(record["id"])
+                    if bet is not None:
+                        bet.update(record)
+                else:
+                    offsets[record.get("id")] = offset
+                    bets[record.get("id")] = record
+            
+            statuses = {bet_id: bet.get("status", "pending") for bet_id, bet in bets.items()}
+            
+            self._bet_offsets = offsets
+            self._bet_statuses = statuses
+            self._status_counts = Counter(statuses.values())
+            self._pending_bets = {bet_id: bet for bet_id, bet in bets.items() if statuses[bet_id] == "pending"}
+            self._patch_count = patches
+        
+        return self._bet_offsets
+    
+    def _read_merged_bet(self, bet_id: str) -> Dict[str, Any]:
+        """
+        Lê uma aposta com todas as alterações gravadas para ela já aplicadas.
+        
+        As alterações sempre vêm depois do registro original, então a leitura
+        começa na posição da aposta e só interpreta as linhas que citam o ID.
+        
+        Args:
+            bet_id: ID da aposta (presente no índice).
+        
+        Returns:
+            dict: Dados atuais da aposta.
+        """
+        needle = _json_dumps(bet_id)
+        
+        with open(self.bets_file, 'rb') as f:
+            f.seek(self._bet_offsets[bet_id])
+            bet = _json_loads(f.readline())
+            
+            for line in f:
+                if needle in line:
+                    record = _json_loads(line)
+                    if record.pop(_PATCH_KEY, False) and record.get("id") == bet_id:
+                        bet.update(record)
+        
+        return bet
+    
+    def _set_bet_status(self, bet_id: str, status: str):
+        """
+        Atualiza o status de uma aposta no índice e a contagem por status.
+        
+        Args:
+            bet_id: ID da aposta.
+            status: Novo status da aposta.
+        """
+        previous = self._bet_statuses.get(bet_id)
+        if previous is not None:
+            self._status_counts[previous] -= 1
+        
+        self._bet_statuses[bet_id] = status
+        self._status_counts[status] += 1
+    
+    def _load_bets(self) -> List[Dict[str, Any]]:
+        """
+        Carrega as apostas com as alterações de status já aplicadas.
+        
+        Returns:
+            list: Apostas na ordem em que foram salvas.
+        """
+        bets = {}
+        
+        for record in self._read_records(self.bets_file):
+            if record.pop(_PATCH_KEY, False):
+                bet = bets.get(record["id"])
+                if bet is not None:
+                    bet.update(record)
+            else:
+                bets[record.get("id")] = record
+        
+        return list(bets.values())
+    
+    def _append_bet_patches(self, patches: List[Dict[str, Any]]):
+        """
+        Grava alterações de apostas e compacta o arquivo se houver alterações demais.
+        
+        Args:
+            patches: Alterações a serem gravadas (devem conter o ID da aposta).
+        """
+        self._append_records(self.bets_file, [dict(patch, **{_PATCH_KEY: True}) for patch in patches])
+        self._patch_count += len(patches)
+        
+        for patch in patches:
+            bet_id = patch["id"]
+            
+            # Mantém o índice de apostas pendentes. Uma aposta que volta a ficar
+            # pendente é relida com todas as alterações (já gravadas acima)
+            if patch["status"] == "pending":
+                bet = self._pending_bets.get(bet_id)
+                if bet is None:
+                    bet = self._read_merged_bet(bet_id)
+                bet.update(patch)
+                self._pending_bets[bet_id] = bet
+            else:
+                self._pending_bets.pop(bet_id, None)
+            
+            self._set_bet_status(bet_id, patch["status"])
+        
+        if self._patch_count > _COMPACT_THRESHOLD:
+            self._write_records(self.bets_file, self._load_bets())
+            self._bet_offsets = None
+            self._patch_count = 0
     
     async def save_bet(self, bet_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -56,28 +588,79 @@ class LocalStorageClient:
         
         Args:
             bet_data: Dicionário contendo os dados da aposta.
-            
+        
         Returns:
             dict: Dados da aposta salva ou None em caso de erro.
         """
         try:
+            # Um único instante para o ID e o timestamp de criação
+            now = time.time_ns()
+            
             # Garante que temos um timestamp de criação
             if "created_at" not in bet_data or not bet_data["created_at"]:
-                bet_data["created_at"] = datetime.now().isoformat()
+                bet_data["created_at"] = _utcnow_iso(now / 1e9)
             
             # Gera um ID único para a aposta
-            bet_data["id"] = f"local_{datetime.now().timestamp()}"
+            bet_data["id"] = _local_id(now)
+            
+            def append():
+                with self._lock:
+                    self._append_bet(bet_data)
             
-            # Carrega as apostas existentes
-            with open(self.bets_file, 'r') as f:
-                bets = json.load(f)
+            await self._run_io(append)
+            await self._sync(self.bets_file)
             
-            # Adiciona a nova aposta
-            bets.append(bet_data)
+            logger.info(f"Aposta salva localmente: {bet_data.get('horse_name')} - {bet_data.get('race')}")
+            return bet_data
+        
+        except Exception as e:
+            logger.error(f"Erro ao salvar aposta localmente: {e}")
+            return None
+    
+    async def save_bet_and_log(self, bet_data: Dict[str, Any], action_type: str, description: str, details: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Salva uma aposta e registra a ação no log do sistema local, com uma
+        única passagem pela thread de E/S e uma única sincronização com o disco.
+        
+        Args:
+            bet_data: Dicionário contendo os dados da aposta.
+            action_type: Tipo de ação registrada no log (bet_queued, etc).
+            description: Descrição da ação.
+            details: Detalhes adicionais da ação (opcional).
+        
+        Returns:
+            dict: Dados da aposta salva ou None em caso de erro.
+        """
+        try:
+            # Um único instante para a aposta e o log
+            now = time.time_ns()
+            created_at = _utcnow_iso(now / 1e9)
             
-            # Salva o arquivo atualizado
-            with open(self.bets_file, 'w') as f:
-                json.dump(bets, f, indent=2)
+            if "created_at" not in bet_data or not bet_data["created_at"]:
+                bet_data["created_at"] = created_at
+            
+            bet_data["id"] = _local_id(now)
+            
+            log_data = {
+                "id": _local_id(now),
+                "action_type": action_type,
+                "description": description,
+                "bet_id": bet_data["id"],
+                "created_at": created_at
+            }
+            
+            if details:
+                log_data["details"] = details
+            
+            def append():
+                with self._lock:
+                    self._append_bet(bet_data)
+                    self._append_log_records([log_data])
+            
+            await self._run_io(append)
+            
+            # As duas solicitações caem na mesma janela de sincronização
+            await asyncio.gather(self._sync(self.bets_file), self._sync(self.logs_file))
             
             logger.info(f"Aposta salva localmente: {bet_data.get('horse_name')} - {bet_data.get('race')}")
             return bet_data
@@ -86,6 +669,22 @@ class LocalStorageClient:
             logger.error(f"Erro ao salvar aposta localmente: {e}")
             return None
     
+    def _append_bet(self, bet_data: Dict[str, Any]):
+        """
+        Acrescenta uma nova aposta ao arquivo e aos índices (chamado com a trava adquirida).
+        
+        Args:
+            bet_data: Dados da aposta, já com ID.
+        """
+        offsets = self._get_bet_offsets()
+        
+        # Acrescenta a nova aposta ao final do arquivo
+        offsets[bet_data["id"]] = self._append_records(self.bets_file, [bet_data])
+        self._set_bet_status(bet_data["id"], bet_data.get("status", "pending"))
+        
+        if bet_data.get("status", "pending") == "pending":
+            self._pending_bets[bet_data["id"]] = dict(bet_data)
+    
     async def update_bet_status(self, bet_id: str, status: str, result: Optional[Dict[str, Any]] = None) -> bool:
         """
         Atualiza o status de uma aposta no armazenamento local.
@@ -94,55 +693,100 @@ class LocalStorageClient:
             bet_id: ID da aposta a ser atualizada.
             status: Novo status da aposta (pending, processing, completed, failed).
             result: Resultado da aposta (opcional).
-            
+        
         Returns:
             bool: True se a atualização for bem-sucedida, False caso contrário.
         """
         try:
-            # Carrega as apostas existentes
-            with open(self.bets_file, 'r') as f:
-                bets = json.load(f)
-            
-            # Encontra a aposta pelo ID
-            for bet in bets:
-                if bet.get("id") == bet_id:
-                    bet["status"] = status
-                    bet["updated_at"] = datetime.now().isoformat()
+            def append() -> bool:
+                with self._lock:
+                    # Verifica se a aposta existe pelo índice de IDs
+                    if bet_id not in self._get_bet_offsets():
+                        return False
                     
-                    if result:
-                        bet["result"] = result
+                    patch = {
+                        "id": bet_id,
+                        "status": status,
+                        "updated_at": _utcnow_iso()
+                    }
                     
-                    # Salva o arquivo atualizado
-                    with open(self.bets_file, 'w') as f:
-                        json.dump(bets, f, indent=2)
+                    if result:
+                        patch["result"] = result
                     
-                    logger.info(f"Status da aposta {bet_id} atualizado para {status}")
+                    self._append_bet_patches([patch])
                     return True
             
-            logger.error(f"Aposta com ID {bet_id} não encontrada")
-            return False
+            if not await self._run_io(append):
+                logger.error(f"Aposta com ID {bet_id} não encontrada")
+                return False
+            
+            await self._sync(self.bets_file)
+            
+            logger.info(f"Status da aposta {bet_id} atualizado para {status}")
+            return True
         
         except Exception as e:
             logger.error(f"Erro ao atualizar status da aposta localmente: {e}")
             return False
     
-    async def get_pending_bets(self) -> List[Dict[str, Any]]:
+    async def update_bets_status(self, bet_ids: List[str], status: str) -> int:
+        """
+        Atualiza o status de várias apostas no armazenamento local, com uma única gravação.
+        
+        Args:
+            bet_ids: IDs das apostas a serem atualizadas.
+            status: Novo status das apostas.
+        
+        Returns:
+            int: Número de apostas atualizadas.
+        """
+        try:
+            def append() -> List[Dict[str, Any]]:
+                with self._lock:
+                    offsets = self._get_bet_offsets()
+                    updated_at = _utcnow_iso()
+                    
+                    patches = [
+                        {"id": bet_id, "status": status, "updated_at": updated_at}
+                        for bet_id in bet_ids if bet_id in offsets
+                    ]
+                    
+                    if patches:
+                        self._append_bet_patches(patches)
+                    
+                    return patches
+            
+            patches = await self._run_io(append)
+            
+            if patches:
+                await self._sync(self.bets_file)
+            
+            logger.info(f"Status de {len(patches)} apostas atualizado para {status}")
+            return len(patches)
+        
+        except Exception as e:
+            logger.error(f"Erro ao atualizar status das apostas localmente: {e}")
+            return 0
+    
+    async def get_pending_bets(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Obtém a lista de apostas pendentes do armazenamento local.
         
+        Args:
+            limit: Número máximo de apostas a serem retornadas.
+        
         Returns:
             list: Lista de apostas pendentes.
         """
         try:
-            # Carrega as apostas existentes
-            with open(self.bets_file, 'r') as f:
-                bets = json.load(f)
-            
-            # Filtra as apostas pendentes
-            pending_bets = [bet for bet in bets if bet.get("status") == "pending"]
+            # Usa o índice de apostas pendentes (sem reler o arquivo). O índice já
+            # está na ordem de gravação, então basta copiar as primeiras apostas
+            def read() -> List[Dict[str, Any]]:
+                with self._lock:
+                    self._get_bet_offsets()
+                    return [dict(bet) for bet in itertools.islice(self._pending_bets.values(), limit)]
             
-            # Ordena por data de criação
-            pending_bets.sort(key=lambda x: x.get("created_at", ""))
+            pending_bets = await self._run_io(read)
             
             logger.info(f"Obtidas {len(pending_bets)} apostas pendentes do armazenamento local.")
             return pending_bets
@@ -151,6 +795,54 @@ class LocalStorageClient:
             logger.error(f"Erro ao obter apostas pendentes do armazenamento local: {e}")
             return []
     
+    async def get_all_bets(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Obtém as apostas mais recentes do armazenamento local.
+        
+        Args:
+            limit: Número máximo de apostas a serem retornadas.
+        
+        Returns:
+            list: Lista de apostas, das mais recentes para as mais antigas.
+        """
+        try:
+            def read() -> List[Dict[str, Any]]:
+                with self._lock:
+                    self._ensure_files()
+                    bets = self._load_bets()
+                return bets[:-limit - 1:-1] if limit > 0 else []
+            
+            return await self._run_io(read)
+        
+        except Exception as e:
+            logger.error(f"Erro ao obter apostas do armazenamento local: {e}")
+            return []
+    
+    async def get_bets_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Obtém as apostas mais recentes com um determinado status do armazenamento local.
+        
+        Args:
+            status: Status das apostas (pending, processing, completed, failed).
+            limit: Número máximo de apostas a serem retornadas.
+        
+        Returns:
+            list: Lista de apostas, das mais recentes para as mais antigas.
+        """
+        try:
+            def read() -> List[Dict[str, Any]]:
+                with self._lock:
+                    self._ensure_files()
+                    bets = self._load_bets()
+                matches = (bet for bet in reversed(bets) if bet.get("status", "pending") == status)
+                return list(itertools.islice(matches, limit))
+            
+            return await self._run_io(read)
+        
+        except Exception as e:
+            logger.error(f"Erro ao obter apostas do armazenamento local: {e}")
+            return []
+    
     async def log_action(self, action_type: str, description: str, related_bet_id: Optional[str] = None, details: Optional[Dict[str, Any]] = None) -> bool:
         """
         Registra uma ação no log do sistema local.
@@ -160,35 +852,46 @@ class LocalStorageClient:
             description: Descrição da ação.
             related_bet_id: ID da aposta relacionada (opcional).
             details: Detalhes adicionais da ação (opcional).
-            
+        
         Returns:
             bool: True se o registro for bem-sucedido, False caso contrário.
         """
-        try:
-            # Carrega os logs existentes
-            with open(self.logs_file, 'r') as f:
-                logs = json.load(f)
-            
-            # Cria o novo log
-            log_data = {
-                "id": f"local_{datetime.now().timestamp()}",
-                "action_type": action_type,
-                "description": description,
-                "created_at": datetime.now().isoformat()
-            }
-            
-            if related_bet_id:
-                log_data["bet_id"] = related_bet_id
-            
-            if details:
-                log_data["details"] = details
+        # Cria o novo log
+        log_data = {
+            "action_type": action_type,
+            "description": description,
+            "created_at": _utcnow_iso()
+        }
+        
+        if related_bet_id:
+            log_data["bet_id"] = related_bet_id
+        
+        if details:
+            log_data["details"] = details
+        
+        return await self.log_actions([log_data])
+    
+    async def log_actions(self, logs: List[Dict[str, Any]]) -> bool:
+        """
+        Registra várias ações no log do sistema local, com uma única gravação.
+        
+        Args:
+            logs: Logs a serem registrados (action_type, description, created_at,
+                e opcionalmente bet_id e details).
+        
+        Returns:
+            bool: True se o registro for bem-sucedido, False caso contrário.
+        """
+        try:
+            records = [dict(log_data, id=_local_id()) for log_data in logs]
             
-            # Adiciona o novo log
-            logs.append(log_data)
+            # Acrescenta os novos logs ao final do arquivo
+            def append():
+                with self._lock:
+                    self._append_log_records(records)
             
-            # Salva o arquivo atualizado
-            with open(self.logs_file, 'w') as f:
-                json.dump(logs, f, indent=2)
+            await self._run_io(append)
+            await self._sync(self.logs_file)
             
             return True
         
@@ -196,6 +899,25 @@ class LocalStorageClient:
             logger.error(f"Erro ao registrar log localmente: {e}")
             return False
     
+    async def process_bet_result(self, bet_id: str, status: str, result: Optional[Dict[str, Any]], action_type: str, description: str, details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Atualiza o status final de uma aposta e registra a ação no log do sistema local.
+        
+        Args:
+            bet_id: ID da aposta.
+            status: Novo status da aposta (completed, failed).
+            result: Resultado da aposta (opcional).
+            action_type: Tipo de ação registrada no log (bet_placed, bet_failed).
+            description: Descrição da ação.
+            details: Detalhes adicionais da ação (opcional).
+            
+        Returns:
+            bool: True se a atualização e o registro forem bem-sucedidos, False caso contrário.
+        """
+        updated = await self.update_bet_status(bet_id, status, result)
+        logged = await self.log_action(action_type, description, bet_id, details)
+        return updated and logged
+    
     async def get_recent_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Obtém os logs mais recentes do sistema local.
@@ -207,15 +929,13 @@ class LocalStorageClient:
             list: Lista de logs.
         """
         try:
-            # Carrega os logs existentes
-            with open(self.logs_file, 'r') as f:
-                logs = json.load(f)
+            # Lê apenas as últimas linhas do arquivo (os logs são gravados em ordem)
+            def read() -> List[Dict[str, Any]]:
+                with self._lock:
+                    self._ensure_files()
+                    return self._read_last_records(self.logs_file, limit)
             
-            # Ordena por data de criação (mais recentes primeiro)
-            logs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-            
-            # Limita o número de logs
-            return logs[:limit]
+            return await self._run_io(read)
         
         except Exception as e:
             logger.error(f"Erro ao obter logs do armazenamento local: {e}")
@@ -229,23 +949,13 @@ class LocalStorageClient:
             dict: Estatísticas das apostas.
         """
         try:
-            # Carrega as apostas existentes
-            with open(self.bets_file, 'r') as f:
-                bets = json.load(f)
-            
-            # Calcula as estatísticas
-            total = len(bets)
-            status_counts = {
-                "pending": 0,
-                "processing": 0,
-                "completed": 0,
-                "failed": 0
-            }
+            # Usa as contagens mantidas a cada gravação (sem reler o arquivo)
+            def read():
+                with self._lock:
+                    total = len(self._get_bet_offsets())
+                    return total, {status: self._status_counts[status] for status in _EMPTY_STATUS_COUNTS}
             
-            for bet in bets:
-                status = bet.get("status", "pending")
-                if status in status_counts:
-                    status_counts[status] += 1
+            total, status_counts = await self._run_io(read)
             
             return {
                 "total": total,
@@ -265,6 +975,114 @@ class LocalStorageClient:
             }
 
 
+# Métodos do SupabaseClient com equivalente no LocalStorageClient (preenchido por _local_fallback)
+_LOCAL_FALLBACK_METHODS = []
+
+
+def _local_fallback(error_message: str):
+    """
+    Decorador para os métodos do SupabaseClient com fallback para o armazenamento local.
+    
+    O método decorado contém apenas o caminho de sucesso: se o Supabase não
+    estiver disponível, ou se a chamada falhar, o método de mesmo nome do
+    LocalStorageClient é chamado com os mesmos argumentos.
+    
+    Args:
+        error_message: Mensagem registrada no log quando a chamada ao Supabase falha.
+    """
+    def decorator(method):
+        _LOCAL_FALLBACK_METHODS.append(method.__name__)
+        
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            # Usa o Supabase se a conexão estiver disponível (ou puder ser restabelecida)
+            if not self.using_local_storage and (self.client or self._connect()):
+                try:
+                    return await method(self, *args, **kwargs)
+                except Exception as e:
+                    logger.error(f"{error_message}: {e}")
+            
+            # Fallback para armazenamento local
+            return await getattr(self._use_local_storage(), method.__name__)(*args, **kwargs)
+        
+        return wrapper
+    
+    return decorator
+
+
+def _ttl_memoize(ttl: float):
+    """
+    Decorador que reaproveita o resultado de uma consulta por alguns segundos.
+    
+    A tarefa da consulta (e não apenas o resultado) é guardada: chamadas
+    simultâneas com os mesmos argumentos aguardam a mesma requisição em vez
+    de dispará-la várias vezes. O cache é limpo pelos métodos de escrita
+    decorados com _invalidates_memo. Cada chamada recebe a sua própria cópia
+    do resultado, para que alterações feitas por um chamador não afetem os demais.
+    
+    Args:
+        ttl: Tempo (s) durante o qual o resultado é reaproveitado.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            loop = asyncio.get_running_loop()
+            
+            cached = self._memo.get(key)
+            # Tarefas só podem ser aguardadas no event loop em que foram criadas
+            if cached and cached[0] > time.monotonic() and cached[1].get_loop() is loop:
+                return _copy_result(await asyncio.shield(cached[1]))
+            
+            task = loop.create_task(method(self, *args, **kwargs))
+            self._memo[key] = (time.monotonic() + ttl, task)
+            
+            try:
+                return _copy_result(await asyncio.shield(task))
+            except Exception:
+                self._memo.pop(key, None)
+                raise
+        
+        return wrapper
+    
+    return decorator
+
+
+def _copy_result(result):
+    """
+    Copia o resultado de uma consulta em cache (listas de registros ou dicionários).
+    
+    Args:
+        result: Resultado compartilhado pela tarefa em cache.
+    
+    Returns:
+        Cópia do resultado, com os registros (dicionários) também copiados.
+    """
+    if isinstance(result, list):
+        return [dict(item) if isinstance(item, dict) else item for item in result]
+    if isinstance(result, dict):
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in result.items()}
+    return result
+
+
+def _invalidates_memo(method):
+    """
+    Decorador para os métodos de escrita: descarta as consultas em cache.
+    
+    O cache é limpo antes e depois da escrita: uma consulta iniciada durante
+    a escrita não fica guardada com os dados anteriores a ela.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        self._memo.clear()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self._memo.clear()
+    
+    return wrapper
+
+
 class SupabaseClient:
     """
     Cliente para interação com o Supabase.
@@ -280,11 +1098,23 @@ class SupabaseClient:
         self.local_client = None
         self.using_local_storage = False
         
+        # Protege a troca para o armazenamento local, que pode ocorrer em várias threads
+        self._local_lock = threading.Lock()
+        
+        # Consultas em cache: (método, argumentos) -> (expiração, tarefa)
+        self._memo = {}
+        
+        # Funções RPC que não existem no banco (não são chamadas novamente)
+        self._rpc_unavailable = set()
+        
+        # Fila de logs gravados em lote por uma thread em segundo plano
+        self._log_queue = queue.Queue()
+        self._log_flusher = None
+        
         # Tenta conectar ao Supabase
         if not self._connect():
             logger.warning("Usando armazenamento local como fallback.")
-            self.local_client = LocalStorageClient()
-            self.using_local_storage = True
+            self._use_local_storage()
     
     def _connect(self) -> bool:
         """
@@ -302,7 +1132,13 @@ class SupabaseClient:
                 logger.warning("URL ou chave do Supabase não configurados corretamente.")
                 return False
             
-            self.client = create_client(self.url, self.key)
+            self.client = _create_client(self.url, self.key)
+            
+            # Inicia a thread que grava os logs enfileirados
+            if not self._log_flusher:
+                self._log_flusher = threading.Thread(target=self._flush_logs_worker, daemon=True)
+                self._log_flusher.start()
+            
             logger.info("Conexão com o Supabase estabelecida com sucesso.")
             return True
         
@@ -310,6 +1146,48 @@ class SupabaseClient:
             logger.error(f"Erro ao conectar ao Supabase: {e}")
             return False
     
+    def _use_local_storage(self) -> LocalStorageClient:
+        """
+        Obtém o cliente de armazenamento local, criando-o se necessário.
+        
+        A partir daí o armazenamento local passa a ser usado em definitivo: os
+        métodos com fallback são substituídos, nesta instância, pelos métodos
+        do LocalStorageClient, e as chamadas seguintes vão direto para eles.
+        
+        Returns:
+            LocalStorageClient: Cliente de armazenamento local.
+        """
+        with self._local_lock:
+            if not self.local_client:
+                local_client = get_local_storage_client()
+                
+                for name in _LOCAL_FALLBACK_METHODS:
+                    setattr(self, name, getattr(local_client, name))
+                
+                # Publicado por último: quem vê o cliente local já vê os métodos trocados
+                self.using_local_storage = True
+                self.local_client = local_client
+        
+        return self.local_client
+    
+    async def _execute(self, query):
+        """
+        Executa uma consulta do Supabase em uma thread do pool padrão.
+        
+        O cliente supabase-py é síncrono; executar a requisição fora do event
+        loop evita que ela bloqueie as demais tarefas assíncronas.
+        
+        Args:
+            query: Consulta montada com o cliente do Supabase.
+            
+        Returns:
+            Resposta da consulta.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, query.execute)
+    
+    @_invalidates_memo
+    @_local_fallback("Erro ao salvar aposta")
     async def save_bet(self, bet_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Salva uma aposta no banco de dados.
@@ -320,45 +1198,94 @@ class SupabaseClient:
         Returns:
             dict: Dados da aposta salva ou None em caso de erro.
         """
-        # Se estiver usando armazenamento local, delega para o cliente local
-        if self.using_local_storage:
-            return await self.local_client.save_bet(bet_data)
+        # Garante que temos um timestamp de criação
+        if "created_at" not in bet_data or not bet_data["created_at"]:
+            bet_data["created_at"] = _utcnow_iso()
         
-        try:
-            if not self.client:
-                if not self._connect():
-                    # Fallback para armazenamento local
-                    if not self.local_client:
-                        self.local_client = LocalStorageClient()
-                        self.using_local_storage = True
-                    return await self.local_client.save_bet(bet_data)
-            
-            # Garante que temos um timestamp de criação
-            if "created_at" not in bet_data or not bet_data["created_at"]:
-                bet_data["created_at"] = datetime.now().isoformat()
-            
-            # Insere a aposta na tabela 'bets'
-            response = self.client.table("bets").insert(bet_data).execute()
+        # Insere a aposta na tabela 'bets'
+        response = await self._execute(self.client.table("bets").insert(bet_data))
+        
+        if response.data:
+            logger.info(f"Aposta salva com sucesso: {bet_data.get('horse_name')} - {bet_data.get('race')}")
+            return response.data[0]
+        else:
+            logger.error(f"Erro ao salvar aposta: {response.error}")
+            # Fallback para armazenamento local
+            return await self._use_local_storage().save_bet(bet_data)
+    
+    @_invalidates_memo
+    @_local_fallback("Erro ao salvar aposta")
+    async def save_bet_and_log(self, bet_data: Dict[str, Any], action_type: str, description: str, details: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Salva uma aposta e registra a ação no log em uma única chamada ao
+        Supabase (função RPC save_bet_with_log).
+        
+        Se a função RPC não existir no banco, recorre às chamadas separadas de
+        save_bet e log_action (e não tenta mais a função). Outros erros não têm
+        esse fallback: a aposta pode ter sido gravada mesmo assim, e salvá-la de
+        novo a duplicaria.
+        
+        Args:
+            bet_data: Dicionário contendo os dados da aposta.
+            action_type: Tipo de ação registrada no log (bet_queued, etc).
+            description: Descrição da ação.
+            details: Detalhes adicionais da ação (opcional).
             
-            if response.data:
-                logger.info(f"Aposta salva com sucesso: {bet_data.get('horse_name')} - {bet_data.get('race')}")
-                return response.data[0]
-            else:
-                logger.error(f"Erro ao salvar aposta: {response.error}")
-                # Fallback para armazenamento local
-                if not self.local_client:
-                    self.local_client = LocalStorageClient()
-                    self.using_local_storage = True
-                return await self.local_client.save_bet(bet_data)
+        Returns:
+            dict: Dados da aposta salva ou None em caso de erro.
+        """
+        # Garante que temos um timestamp de criação
+        if "created_at" not in bet_data or not bet_data["created_at"]:
+            bet_data["created_at"] = _utcnow_iso()
+        
+        if "save_bet_with_log" in self._rpc_unavailable:
+            return await self._save_bet_then_log(bet_data, action_type, description, details)
+        
+        try:
+            response = await self._execute(self.client.rpc("save_bet_with_log", {
+                "p_bet": bet_data,
+                "p_action_type": action_type,
+                "p_description": description,
+                "p_details": details
+            }))
         
         except Exception as e:
-            logger.error(f"Erro ao salvar aposta: {e}")
+            if not _is_missing_function(e):
+                raise
+            
+            self._rpc_unavailable.add("save_bet_with_log")
+            logger.warning(f"Função save_bet_with_log não encontrada no banco; usando chamadas separadas: {e}")
+            return await self._save_bet_then_log(bet_data, action_type, description, details)
+        
+        if response.data:
+            logger.info(f"Aposta salva com sucesso: {bet_data.get('horse_name')} - {bet_data.get('race')}")
+            return response.data[0]
+        else:
+            logger.error(f"Erro ao salvar aposta: {response.error}")
             # Fallback para armazenamento local
-            if not self.local_client:
-                self.local_client = LocalStorageClient()
-                self.using_local_storage = True
-            return await self.local_client.save_bet(bet_data)
+            return await self._use_local_storage().save_bet_and_log(bet_data, action_type, description, details)
+    
+    async def _save_bet_then_log(self, bet_data: Dict[str, Any], action_type: str, description: str, details: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Salva uma aposta e registra a ação no log com chamadas separadas
+        (usado quando a função RPC save_bet_with_log não existe no banco).
+        
+        Args:
+            bet_data: Dicionário contendo os dados da aposta.
+            action_type: Tipo de ação registrada no log.
+            description: Descrição da ação.
+            details: Detalhes adicionais da ação (opcional).
+            
+        Returns:
+            dict: Dados da aposta salva ou None em caso de erro.
+        """
+        saved_bet = await self.save_bet(bet_data)
+        if saved_bet:
+            await self.log_action(action_type, description, saved_bet.get("id"), details)
+        return saved_bet
     
+    @_invalidates_memo
+    @_local_fallback("Erro ao atualizar status da aposta")
     async def update_bet_status(self, bet_id: str, status: str, result: Optional[Dict[str, Any]] = None) -> bool:
         """
         Atualiza o status de uma aposta.
@@ -371,85 +1298,103 @@ class SupabaseClient:
         Returns:
             bool: True se a atualização for bem-sucedida, False caso contrário.
         """
-        # Se estiver usando armazenamento local, delega para o cliente local
-        if self.using_local_storage:
-            return await self.local_client.update_bet_status(bet_id, status, result)
+        update_data = {
+            "status": status,
+            "updated_at": _utcnow_iso()
+        }
         
-        try:
-            if not self.client:
-                if not self._connect():
-                    # Fallback para armazenamento local
-                    if not self.local_client:
-                        self.local_client = LocalStorageClient()
-                        self.using_local_storage = True
-                    return await self.local_client.update_bet_status(bet_id, status, result)
-            
-            update_data = {
-                "status": status,
-                "updated_at": datetime.now().isoformat()
-            }
-            
-            if result:
-                update_data["result"] = json.dumps(result)
-            
-            response = self.client.table("bets").update(update_data).eq("id", bet_id).execute()
-            
-            if response.data:
-                logger.info(f"Status da aposta {bet_id} atualizado para {status}")
-                return True
-            else:
-                logger.error(f"Erro ao atualizar status da aposta: {response.error}")
-                # Fallback para armazenamento local
-                if not self.local_client:
-                    self.local_client = LocalStorageClient()
-                    self.using_local_storage = True
-                return await self.local_client.update_bet_status(bet_id, status, result)
+        if result:
+            update_data["result"] = result
         
-        except Exception as e:
-            logger.error(f"Erro ao atualizar status da aposta: {e}")
+        response = await self._execute(self.client.table("bets").update(update_data).eq("id", bet_id))
+        
+        if response.data:
+            logger.info(f"Status da aposta {bet_id} atualizado para {status}")
+            return True
+        else:
+            logger.error(f"Erro ao atualizar status da aposta: {response.error}")
             # Fallback para armazenamento local
-            if not self.local_client:
-                self.local_client = LocalStorageClient()
-                self.using_local_storage = True
-            return await self.local_client.update_bet_status(bet_id, status, result)
+            return await self._use_local_storage().update_bet_status(bet_id, status, result)
     
-    async def get_pending_bets(self) -> List[Dict[str, Any]]:
+    @_invalidates_memo
+    @_local_fallback("Erro ao atualizar status das apostas")
+    async def update_bets_status(self, bet_ids: List[str], status: str) -> int:
         """
-        Obtém a lista de apostas pendentes.
+        Atualiza o status de várias apostas com uma única requisição.
         
+        Args:
+            bet_ids: IDs das apostas a serem atualizadas.
+            status: Novo status das apostas.
+            
+        Returns:
+            int: Número de apostas atualizadas.
+        """
+        if not bet_ids:
+            return 0
+        
+        update_data = {
+            "status": status,
+            "updated_at": _utcnow_iso()
+        }
+        
+        response = await self._execute(self.client.table("bets").update(update_data).in_("id", bet_ids))
+        
+        logger.info(f"Status de {len(response.data)} apostas atualizado para {status}")
+        return len(response.data)
+    
+    @_ttl_memoize(_PENDING_MEMO_TTL)
+    @_local_fallback("Erro ao obter apostas pendentes")
+    async def get_pending_bets(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Obtém a lista de apostas pendentes, das mais antigas para as mais recentes.
+        
+        Args:
+            limit: Número máximo de apostas a serem retornadas.
+            
         Returns:
             list: Lista de apostas pendentes.
         """
-        # Se estiver usando armazenamento local, delega para o cliente local
-        if self.using_local_storage:
-            return await self.local_client.get_pending_bets()
+        response = await self._execute(self.client.table("bets").select(_PENDING_BET_COLUMNS).eq("status", "pending").order("created_at").limit(limit))
         
-        try:
-            if not self.client:
-                if not self._connect():
-                    # Fallback para armazenamento local
-                    if not self.local_client:
-                        self.local_client = LocalStorageClient()
-                        self.using_local_storage = True
-                    return await self.local_client.get_pending_bets()
-            
-            response = self.client.table("bets").select("*").eq("status", "pending").order("created_at").execute()
-            
-            if response.data:
-                logger.info(f"Obtidas {len(response.data)} apostas pendentes.")
-                return response.data
-            else:
-                logger.debug("Nenhuma aposta pendente encontrada.")
-                return []
+        if response.data:
+            logger.info(f"Obtidas {len(response.data)} apostas pendentes.")
+            return response.data
+        else:
+            logger.debug("Nenhuma aposta pendente encontrada.")
+            return []
+    
+    @_ttl_memoize(_MEMO_TTL)
+    @_local_fallback("Erro ao obter apostas")
+    async def get_all_bets(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Obtém as apostas mais recentes.
         
-        except Exception as e:
-            logger.error(f"Erro ao obter apostas pendentes: {e}")
-            # Fallback para armazenamento local
-            if not self.local_client:
-                self.local_client = LocalStorageClient()
-                self.using_local_storage = True
-            return await self.local_client.get_pending_bets()
+        Args:
+            limit: Número máximo de apostas a serem retornadas.
+            
+        Returns:
+            list: Lista de apostas, das mais recentes para as mais antigas.
+        """
+        response = await self._execute(self.client.table("bets").select("*").order("created_at", desc=True).limit(limit))
+        return response.data or []
+    
+    @_ttl_memoize(_MEMO_TTL)
+    @_local_fallback("Erro ao obter apostas")
+    async def get_bets_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Obtém as apostas mais recentes com um determinado status.
+        
+        Args:
+            status: Status das apostas (pending, processing, completed, failed).
+            limit: Número máximo de apostas a serem retornadas.
+            
+        Returns:
+            list: Lista de apostas, das mais recentes para as mais antigas.
+        """
+        response = await self._execute(self.client.table("bets").select("*").eq("status", status).order("created_at", desc=True).limit(limit))
+        return response.data or []
     
+    @_local_fallback("Erro ao registrar log")
     async def log_action(self, action_type: str, description: str, related_bet_id: Optional[str] = None, details: Optional[Dict[str, Any]] = None) -> bool:
         """
         Registra uma ação no log do sistema.
@@ -461,53 +1406,150 @@ class SupabaseClient:
             details: Detalhes adicionais da ação (opcional).
             
         Returns:
-            bool: True se o registro for bem-sucedido, False caso contrário.
+            bool: True se o log for enfileirado para gravação. A inserção é feita
+                depois, em lote; falhas são registradas pela thread de gravação.
         """
-        # Se estiver usando armazenamento local, delega para o cliente local
-        if self.using_local_storage:
-            return await self.local_client.log_action(action_type, description, related_bet_id, details)
+        log_data = {
+            "action_type": action_type,
+            "description": description,
+            "created_at": _utcnow_iso()
+        }
         
-        try:
-            if not self.client:
-                if not self._connect():
-                    # Fallback para armazenamento local
-                    if not self.local_client:
-                        self.local_client = LocalStorageClient()
-                        self.using_local_storage = True
-                    return await self.local_client.log_action(action_type, description, related_bet_id, details)
-            
-            log_data = {
-                "action_type": action_type,
-                "description": description,
-                "created_at": datetime.now().isoformat()
-            }
+        if related_bet_id:
+            log_data["bet_id"] = related_bet_id
+        
+        if details:
+            log_data["details"] = details
+        
+        # A inserção é feita em lote pela thread de gravação de logs
+        self._log_queue.put(log_data)
+        return True
+    
+    def _flush_logs_worker(self):
+        """
+        Grava os logs enfileirados em lotes, com uma única inserção por lote.
+        """
+        while True:
+            # Aguarda o primeiro log e agrupa os que chegarem dentro do intervalo
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + _LOG_FLUSH_INTERVAL
             
-            if related_bet_id:
-                log_data["bet_id"] = related_bet_id
+            while len(batch) < _LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
             
-            if details:
-                log_data["details"] = json.dumps(details)
+            try:
+                self._insert_logs(batch)
+            except Exception as e:
+                # Um lote perdido não pode encerrar a thread (flush ficaria aguardando)
+                logger.error(f"Erro ao gravar lote de {len(batch)} logs; logs descartados: {e}")
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+    
+    def _insert_logs(self, batch: List[Dict[str, Any]]):
+        """
+        Insere um lote de logs no Supabase, recorrendo ao armazenamento local em caso de erro.
+        
+        Uma falha aqui grava apenas o lote no armazenamento local: a troca
+        definitiva do cliente fica com as chamadas feitas pelos workers.
+        
+        Args:
+            batch: Lista de logs a serem inseridos.
+        """
+        if not self.using_local_storage:
+            try:
+                # return=minimal: o Supabase não devolve as linhas inseridas (erros geram exceção)
+                self.client.table("logs").insert(batch, returning=ReturnMethod.minimal).execute()
+                return
             
-            response = self.client.table("logs").insert(log_data).execute()
+            except Exception as e:
+                logger.error(f"Erro ao registrar logs: {e}")
+        
+        # Fallback para armazenamento local
+        asyncio.run(get_local_storage_client().log_actions(batch))
+    
+    def flush(self, timeout: float = _LOG_FLUSH_TIMEOUT) -> bool:
+        """
+        Aguarda a gravação de todos os logs enfileirados, por no máximo "timeout" segundos.
+        
+        Deve ser chamado no encerramento ou quando for necessário garantir
+        que os logs já registrados estejam persistidos. É síncrono: pode ser
+        chamado de qualquer thread, com ou sem um event loop em execução.
+        
+        Args:
+            timeout: Tempo máximo de espera, em segundos.
+        
+        Returns:
+            bool: True se todos os logs foram gravados, False se o tempo se esgotou.
+        """
+        if not self._log_flusher:
+            return True
+        
+        deadline = time.monotonic() + timeout
+        while self._log_queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                logger.warning(f"{self._log_queue.unfinished_tasks} logs ainda não gravados após {timeout}s")
+                return False
+            time.sleep(0.05)
+        
+        return True
+    
+    @_invalidates_memo
+    @_local_fallback("Erro ao atualizar status da aposta")
+    async def process_bet_result(self, bet_id: str, status: str, result: Optional[Dict[str, Any]], action_type: str, description: str, details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Atualiza o status final de uma aposta e registra a ação no log em uma
+        única chamada ao Supabase (função RPC process_bet_result).
+        
+        Se a função RPC não existir no banco, recorre às chamadas separadas de
+        update_bet_status e log_action (e não tenta mais a função). Outros erros
+        não têm esse fallback: a função pode ter sido executada mesmo assim, e
+        repetir as gravações duplicaria o log.
+        
+        Args:
+            bet_id: ID da aposta.
+            status: Novo status da aposta (completed, failed).
+            result: Resultado da aposta (opcional).
+            action_type: Tipo de ação registrada no log (bet_placed, bet_failed).
+            description: Descrição da ação.
+            details: Detalhes adicionais da ação (opcional).
             
-            if response.data:
+        Returns:
+            bool: True se a atualização e o registro forem bem-sucedidos, False caso contrário.
+        """
+        if "process_bet_result" not in self._rpc_unavailable:
+            try:
+                await self._execute(self.client.rpc("process_bet_result", {
+                    "p_bet_id": bet_id,
+                    "p_status": status,
+                    "p_result": result,
+                    "p_action_type": action_type,
+                    "p_description": description,
+                    "p_details": details
+                }))
+                
+                logger.info(f"Status da aposta {bet_id} atualizado para {status}")
                 return True
-            else:
-                logger.error(f"Erro ao registrar log: {response.error}")
-                # Fallback para armazenamento local
-                if not self.local_client:
-                    self.local_client = LocalStorageClient()
-                    self.using_local_storage = True
-                return await self.local_client.log_action(action_type, description, related_bet_id, details)
+            
+            except Exception as e:
+                if not _is_missing_function(e):
+                    raise
+                
+                self._rpc_unavailable.add("process_bet_result")
+                logger.warning(f"Função process_bet_result não encontrada no banco; usando chamadas separadas: {e}")
         
-        except Exception as e:
-            logger.error(f"Erro ao registrar log: {e}")
-            # Fallback para armazenamento local
-            if not self.local_client:
-                self.local_client = LocalStorageClient()
-                self.using_local_storage = True
-            return await self.local_client.log_action(action_type, description, related_bet_id, details)
+        updated = await self.update_bet_status(bet_id, status, result)
+        logged = await self.log_action(action_type, description, bet_id, details)
+        return updated and logged
     
+    @_ttl_memoize(_MEMO_TTL)
+    @_local_fallback("Erro ao obter logs")
     async def get_recent_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Obtém os logs mais recentes do sistema.
@@ -518,34 +1560,15 @@ class SupabaseClient:
         Returns:
             list: Lista de logs.
         """
-        # Se estiver usando armazenamento local, delega para o cliente local
-        if self.using_local_storage:
-            return await self.local_client.get_recent_logs(limit)
-        
-        try:
-            if not self.client:
-                if not self._connect():
-                    # Fallback para armazenamento local
-                    if not self.local_client:
-                        self.local_client = LocalStorageClient()
-                        self.using_local_storage = True
-                    return await self.local_client.get_recent_logs(limit)
-            
-            response = self.client.table("logs").select("*").order("created_at", desc=True).limit(limit).execute()
-            
-            if response.data:
-                return response.data
-            else:
-                return []
+        response = await self._execute(self.client.table("logs").select("*").order("created_at", desc=True).limit(limit))
         
-        except Exception as e:
-            logger.error(f"Erro ao obter logs: {e}")
-            # Fallback para armazenamento local
-            if not self.local_client:
-                self.local_client = LocalStorageClient()
-                self.using_local_storage = True
-            return await self.local_client.get_recent_logs(limit)
+        if response.data:
+            return response.data
+        else:
+            return []
     
+    @_ttl_memoize(_MEMO_TTL)
+    @_local_fallback("Erro ao obter estatísticas")
     async def get_bet_statistics(self) -> Dict[str, Any]:
         """
         Obtém estatísticas sobre as apostas.
@@ -553,41 +1576,93 @@ class SupabaseClient:
         Returns:
             dict: Estatísticas das apostas.
         """
-        # Se estiver usando armazenamento local, delega para o cliente local
-        if self.using_local_storage:
-            return await self.local_client.get_bet_statistics()
+        if "bet_status_counts" in self._rpc_unavailable:
+            return await self._count_bets_by_status()
         
+        # Contagem por status em uma única consulta (função RPC bet_status_counts).
+        # Só a ausência da função leva às consultas separadas; os demais erros
+        # seguem para o fallback do armazenamento local
         try:
-            if not self.client:
-                if not self._connect():
-                    # Fallback para armazenamento local
-                    if not self.local_client:
-                        self.local_client = LocalStorageClient()
-                        self.using_local_storage = True
-                    return await self.local_client.get_bet_statistics()
-            
-            # Total de apostas
-            total_response = self.client.table("bets").select("count", count="exact").execute()
-            total = total_response.count if hasattr(total_response, "count") else 0
-            
-            # Apostas por status
-            status_counts = {}
-            for status in ["pending", "processing", "completed", "failed"]:
-                status_response = self.client.table("bets").select("count", count="exact").eq("status", status).execute()
-                status_counts[status] = status_response.count if hasattr(status_response, "count") else 0
+            response = await self._execute(self.client.rpc("bet_status_counts"))
+        except Exception as e:
+            if not _is_missing_function(e):
+                raise
             
-            return {
-                "total": total,
-                "status_counts": status_counts
-            }
+            self._rpc_unavailable.add("bet_status_counts")
+            logger.warning(f"Função bet_status_counts não encontrada no banco; usando consultas separadas: {e}")
+            return await self._count_bets_by_status()
         
-        except Exception as e:
-            logger.error(f"Erro ao obter estatísticas: {e}")
-            # Fallback para armazenamento local
-            if not self.local_client:
-                self.local_client = LocalStorageClient()
-                self.using_local_storage = True
-            return await self.local_client.get_bet_statistics()
+        rows = response.data or []
+        
+        return {
+            "total": sum(row["cnt"] for row in rows),
+            "status_counts": {**_EMPTY_STATUS_COUNTS, **{row["status"]: row["cnt"] for row in rows}}
+        }
+    
+    async def _count_bets_by_status(self) -> Dict[str, Any]:
+        """
+        Obtém as estatísticas das apostas com uma consulta de contagem por status.
+        
+        Usado quando a função RPC bet_status_counts não está disponível no banco;
+        as consultas são feitas em paralelo.
+        
+        Returns:
+            dict: Estatísticas das apostas.
+        """
+        statuses = ["pending", "processing", "completed", "failed"]
+        
+        responses = await asyncio.gather(
+            self._execute(self.client.table("bets").select("count", count="exact")),
+            *(self._execute(self.client.table("bets").select("count", count="exact").eq("status", status)) for status in statuses)
+        )
+        
+        counts = [response.count or 0 for response in responses]
+        
+        return {
+            "total": counts[0],
+            "status_counts": dict(zip(statuses, counts[1:]))
+        }
+
+
+# Instância global do cliente
+_supabase_client_instance = None
+
+# Instância global do armazenamento local (compartilhada por todos os clientes)
+_local_storage_client_instance = None
+_local_storage_client_lock = threading.Lock()
+
+
+def get_local_storage_client() -> LocalStorageClient:
+    """
+    Obtém a instância global do cliente de armazenamento local.
+    
+    Uma única instância evita que os arquivos de dados sejam acessados com
+    índices e travas separados, e que a inicialização seja repetida.
+    
+    Returns:
+        LocalStorageClient: Instância do cliente de armazenamento local.
+    """
+    global _local_storage_client_instance
+    
+    with _local_storage_client_lock:
+        if _local_storage_client_instance is None:
+            _local_storage_client_instance = LocalStorageClient()
+    
+    return _local_storage_client_instance
+
+def get_supabase_client() -> SupabaseClient:
+    """
+    Obtém a instância global do cliente do Supabase.
+    
+    Returns:
+        SupabaseClient: Instância do cliente do Supabase.
+    """
+    global _supabase_client_instance
+    
+    if _supabase_client_instance is None:
+        _supabase_client_instance = SupabaseClient()
+    
+    return _supabase_client_instance
 
 
 # Função para criar as tabelas necessárias no Supabase
@@ -598,7 +1673,7 @@ async def setup_supabase_tables():
     Esta função deve ser executada uma vez para criar a estrutura inicial do banco de dados.
     """
     try:
-        client = SupabaseClient()
+        client = get_supabase_client()
         if client.using_local_storage:
             logger.warning("Usando armazenamento local, não é necessário configurar tabelas.")
             return True
@@ -1,22 +1,44 @@
 import os
+import stat
 import sys
+import functools
+from collections import deque
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTextEdit, QFormLayout, QSpinBox,
     QDoubleSpinBox, QComboBox, QCheckBox, QGroupBox, QMessageBox,
     QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QSplitter,
-    QStyleFactory, QAction
+    QStyleFactory, QAction, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import numpy as np
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QObject, QRunnable, QThreadPool
+from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor, QIntValidator, QTextCursor
 from datetime import datetime
 
 from .telegram_integration import TelegramIntegration
 
+@functools.lru_cache(maxsize=None)
+def _title_font():
+    """
+    Retorna a fonte dos títulos dos widgets, criada uma única vez.
+    
+    A fonte é criada no primeiro uso (e não na importação do módulo)
+    porque o QApplication precisa existir antes.
+    
+    Returns:
+        QFont: Fonte compartilhada pelos títulos.
+    """
+    return QFont("Arial", 12, QFont.Bold)
+
+@functools.lru_cache(maxsize=None)
+def _positive_int_validator():
+    """
+    Retorna um validador de números inteiros positivos compartilhado pelos campos numéricos.
+    
+    Returns:
+        QIntValidator: Validador compartilhado.
+    """
+    return QIntValidator(1, 2**31 - 1)
+
 class ThemeManager:
     """
     Gerenciador de temas para a aplicação.
@@ -42,6 +64,36 @@ class ThemeManager:
         "border": "#333333"
     }
     
+    # Folhas de estilo de cada tema, montadas uma única vez na definição da classe
+    _DARK_QSS = f"""
+                QToolTip {{ color: {DARK_THEME["text"]}; background-color: {DARK_THEME["card"]}; border: 1px solid {DARK_THEME["border"]}; }}
+                QGroupBox {{ border: 1px solid {DARK_THEME["border"]}; border-radius: 5px; margin-top: 1ex; }}
+                QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top center; padding: 0 3px; }}
+                QTabWidget::pane {{ border: 1px solid {DARK_THEME["border"]}; }}
+                QTabBar::tab {{ background: {DARK_THEME["card"]}; border: 1px solid {DARK_THEME["border"]}; padding: 5px; }}
+                QTabBar::tab:selected {{ background: {DARK_THEME["accent"]}; }}
+                QHeaderView::section {{ background-color: {DARK_THEME["card"]}; color: {DARK_THEME["text"]}; padding: 4px; border: 1px solid {DARK_THEME["border"]}; }}
+                QTableWidget {{ gridline-color: {DARK_THEME["border"]}; }}
+                QTableWidget QTableCornerButton::section {{ background: {DARK_THEME["card"]}; border: 1px solid {DARK_THEME["border"]}; }}
+            """
+    
+    _LIGHT_QSS = f"""
+                QGroupBox {{ border: 1px solid {LIGHT_THEME["border"]}; border-radius: 5px; margin-top: 1ex; }}
+                QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top center; padding: 0 3px; }}
+                QTabWidget::pane {{ border: 1px solid {LIGHT_THEME["border"]}; }}
+                QTabBar::tab {{ background: {LIGHT_THEME["card"]}; border: 1px solid {LIGHT_THEME["border"]}; padding: 5px; }}
+                QTabBar::tab:selected {{ background: {LIGHT_THEME["accent"]}; color: white; }}
+                QHeaderView::section {{ background-color: {LIGHT_THEME["card"]}; padding: 4px; border: 1px solid {LIGHT_THEME["border"]}; }}
+                QTableWidget {{ gridline-color: {LIGHT_THEME["border"]}; }}
+                QTableWidget QTableCornerButton::section {{ background: {LIGHT_THEME["card"]}; border: 1px solid {LIGHT_THEME["border"]}; }}
+            """
+    
+    # Paleta do tema escuro, criada no primeiro uso (depende do QApplication)
+    _dark_palette = None
+    
+    # Último tema aplicado (aplicação, is_dark), para evitar reaplicar o mesmo tema
+    _applied_theme = None
+    
     @staticmethod
     def apply_theme(app, is_dark=False):
         """
@@ -53,56 +105,45 @@ class ThemeManager:
         """
         theme = ThemeManager.DARK_THEME if is_dark else ThemeManager.LIGHT_THEME
         
+        # O mesmo tema já está aplicado: evita repolir todos os widgets
+        if ThemeManager._applied_theme == (id(app), is_dark):
+            return theme
+        
+        # Estilo comum aos dois temas
+        if ThemeManager._applied_theme is None or ThemeManager._applied_theme[0] != id(app):
+            app.setStyle(QStyleFactory.create("Fusion"))
+        
         # Define a paleta de cores
         if is_dark:
-            app.setStyle(QStyleFactory.create("Fusion"))
+            # Cria a paleta escura apenas na primeira vez
+            if ThemeManager._dark_palette is None:
+                palette = app.palette()
+                palette.setColor(palette.Window, QColor(theme["background"]))
+                palette.setColor(palette.WindowText, QColor(theme["text"]))
+                palette.setColor(palette.Base, QColor(theme["card"]))
+                palette.setColor(palette.AlternateBase, QColor(theme["border"]))
+                palette.setColor(palette.ToolTipBase, QColor(theme["text"]))
+                palette.setColor(palette.ToolTipText, QColor(theme["background"]))
+                palette.setColor(palette.Text, QColor(theme["text"]))
+                palette.setColor(palette.Button, QColor(theme["card"]))
+                palette.setColor(palette.ButtonText, QColor(theme["text"]))
+                palette.setColor(palette.BrightText, Qt.red)
+                palette.setColor(palette.Link, QColor(theme["accent"]))
+                palette.setColor(palette.Highlight, QColor(theme["accent"]))
+                palette.setColor(palette.HighlightedText, QColor(theme["background"]))
+                ThemeManager._dark_palette = palette
             
-            # Cria uma paleta escura
-            palette = app.palette()
-            palette.setColor(palette.Window, QColor(theme["background"]))
-            palette.setColor(palette.WindowText, QColor(theme["text"]))
-            palette.setColor(palette.Base, QColor(theme["card"]))
-            palette.setColor(palette.AlternateBase, QColor(theme["border"]))
-            palette.setColor(palette.ToolTipBase, QColor(theme["text"]))
-            palette.setColor(palette.ToolTipText, QColor(theme["background"]))
-            palette.setColor(palette.Text, QColor(theme["text"]))
-            palette.setColor(palette.Button, QColor(theme["card"]))
-            palette.setColor(palette.ButtonText, QColor(theme["text"]))
-            palette.setColor(palette.BrightText, Qt.red)
-            palette.setColor(palette.Link, QColor(theme["accent"]))
-            palette.setColor(palette.Highlight, QColor(theme["accent"]))
-            palette.setColor(palette.HighlightedText, QColor(theme["background"]))
-            
-            app.setPalette(palette)
+            app.setPalette(ThemeManager._dark_palette)
             
             # Define o estilo das folhas
-            app.setStyleSheet(f"""
-                QToolTip {{ color: {theme["text"]}; background-color: {theme["card"]}; border: 1px solid {theme["border"]}; }}
-                QGroupBox {{ border: 1px solid {theme["border"]}; border-radius: 5px; margin-top: 1ex; }}
-                QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top center; padding: 0 3px; }}
-                QTabWidget::pane {{ border: 1px solid {theme["border"]}; }}
-                QTabBar::tab {{ background: {theme["card"]}; border: 1px solid {theme["border"]}; padding: 5px; }}
-                QTabBar::tab:selected {{ background: {theme["accent"]}; }}
-                QHeaderView::section {{ background-color: {theme["card"]}; color: {theme["text"]}; padding: 4px; border: 1px solid {theme["border"]}; }}
-                QTableWidget {{ gridline-color: {theme["border"]}; }}
-                QTableWidget QTableCornerButton::section {{ background: {theme["card"]}; border: 1px solid {theme["border"]}; }}
-            """)
+            app.setStyleSheet(ThemeManager._DARK_QSS)
         else:
-            app.setStyle(QStyleFactory.create("Fusion"))
             app.setPalette(app.style().standardPalette())
             
             # Define o estilo das folhas para o tema claro
-            app.setStyleSheet(f"""
-                QGroupBox {{ border: 1px solid {theme["border"]}; border-radius: 5px; margin-top: 1ex; }}
-                QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top center; padding: 0 3px; }}
-                QTabWidget::pane {{ border: 1px solid {theme["border"]}; }}
-                QTabBar::tab {{ background: {theme["card"]}; border: 1px solid {theme["border"]}; padding: 5px; }}
-                QTabBar::tab:selected {{ background: {theme["accent"]}; color: white; }}
-                QHeaderView::section {{ background-color: {theme["card"]}; padding: 4px; border: 1px solid {theme["border"]}; }}
-                QTableWidget {{ gridline-color: {theme["border"]}; }}
-                QTableWidget QTableCornerButton::section {{ background: {theme["card"]}; border: 1px solid {theme["border"]}; }}
-            """)
+            app.setStyleSheet(ThemeManager._LIGHT_QSS)
         
+        ThemeManager._applied_theme = (id(app), is_dark)
         return theme
 
 class NotificationSystem:
@@ -110,9 +151,15 @@ class NotificationSystem:
     Sistema de notificações para alertar sobre eventos importantes.
     """
     
+    # Número máximo de notificações mantidas; as mais antigas são descartadas
+    MAX_NOTIFICATIONS = 500
+    
     def __init__(self, parent=None):
         self.parent = parent
-        self.notifications = []
+        self.notifications = deque(maxlen=self.MAX_NOTIFICATIONS)
+        
+        # Número de notificações não lidas, mantido a cada alteração
+        self._unread = 0
     
     def add_notification(self, title, message, type_="info"):
         """
@@ -133,7 +180,12 @@ class NotificationSystem:
             "read": False
         }
         
+        # A notificação mais antiga é descartada se o limite foi atingido
+        if len(self.notifications) == self.notifications.maxlen and not self.notifications[0]["read"]:
+            self._unread -= 1
+        
         self.notifications.append(notification)
+        self._unread += 1
         
         # Exibe a notificação
         self.show_notification(notification)
@@ -148,11 +200,15 @@ class NotificationSystem:
             notification: Dicionário com os dados da notificação
         """
         if self.parent:
+            # Confirmações de sucesso aparecem na barra de status por alguns
+            # segundos, sem abrir uma janela que precisa ser fechada
+            if notification["type"] == "success" and isinstance(self.parent, QMainWindow):
+                self.parent.statusBar().showMessage(notification["message"], 2000)
+                return
+            
             icon = QMessageBox.Information
             
-            if notification["type"] == "success":
-                icon = QMessageBox.Information
-            elif notification["type"] == "warning":
+            if notification["type"] == "warning":
                 icon = QMessageBox.Warning
             elif notification["type"] == "error":
                 icon = QMessageBox.Critical
@@ -174,7 +230,26 @@ class NotificationSystem:
             index: Índice da notificação
         """
         if 0 <= index < len(self.notifications):
-            self.notifications[index]["read"] = True
+            self.mark_notification_as_read(self.notifications[index])
+    
+    def mark_notification_as_read(self, notification):
+        """
+        Marca uma notificação como lida a partir do próprio registro.
+        
+        Ao contrário do índice, o registro continua identificando a mesma
+        notificação depois que as mais antigas são descartadas.
+        
+        Args:
+            notification: Notificação obtida de get_all_notifications.
+        """
+        if notification["read"]:
+            return
+        
+        notification["read"] = True
+        
+        # Notificações já descartadas não fazem mais parte da contagem
+        if any(item is notification for item in self.notifications):
+            self._unread -= 1
     
     def get_unread_count(self):
         """
@@ -183,7 +258,14 @@ class NotificationSystem:
         Returns:
             Número de notificações não lidas
         """
-        return sum(1 for n in self.notifications if not n["read"])
+        return self._unread
+    
+    def clear(self):
+        """
+        Remove todas as notificações.
+        """
+        self.notifications.clear()
+        self._unread = 0
     
     def get_all_notifications(self):
         """
@@ -199,9 +281,23 @@ class NotificationsWidget(QWidget):
     Widget para exibir e gerenciar notificações.
     """
     
+    # Cor de fundo da linha para cada tipo de notificação (criadas uma única vez)
+    _BG = {
+        "success": QColor(200, 255, 200),  # Verde claro
+        "warning": QColor(255, 255, 200),  # Amarelo claro
+        "error": QColor(255, 200, 200)  # Vermelho claro
+    }
+    
+    # Texto em cinza para notificações lidas
+    _FG_READ = QColor(150, 150, 150)
+    
     def __init__(self, notification_system, parent=None):
         super().__init__(parent)
         self.notification_system = notification_system
+        
+        # Notificação exibida em cada linha da tabela (na ordem das linhas)
+        self._row_notifications = []
+        
         self.init_ui()
     
     def init_ui(self):
@@ -210,7 +306,7 @@ class NotificationsWidget(QWidget):
         
         # Título
         title = QLabel("Centro de Notificações")
-        title.setFont(QFont("Arial", 12, QFont.Bold))
+        title.setFont(_title_font())
         layout.addWidget(title)
         
         # Tabela de notificações
@@ -219,6 +315,8 @@ class NotificationsWidget(QWidget):
             "Hora", "Título", "Mensagem"
         ])
         self.notifications_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Seleção por linha: cada notificação é uma linha inteira
+        self.notifications_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         layout.addWidget(self.notifications_table)
         
         # Botões de ação
@@ -246,53 +344,52 @@ class NotificationsWidget(QWidget):
     
     def refresh_notifications(self):
         """Atualiza a exibição de notificações."""
-        # Limpa a tabela
-        self.notifications_table.setRowCount(0)
-        
         # Obtém todas as notificações
-        notifications = self.notification_system.get_all_notifications()
+        notifications = list(self.notification_system.get_all_notifications())
+        self._row_notifications = notifications
+        
+        # Preenche a tabela de uma vez, com uma única repintura ao final
+        self.notifications_table.setUpdatesEnabled(False)
+        self.notifications_table.setRowCount(0)
+        self.notifications_table.setRowCount(len(notifications))
         
         # Adiciona as notificações à tabela
-        for i, notification in enumerate(notifications):
-            row = self.notifications_table.rowCount()
-            self.notifications_table.insertRow(row)
-            
+        for row, notification in enumerate(notifications):
             # Formata a hora
             timestamp = notification["timestamp"].strftime("%H:%M:%S")
             
-            # Adiciona os dados à tabela
-            self.notifications_table.setItem(row, 0, QTableWidgetItem(timestamp))
-            self.notifications_table.setItem(row, 1, QTableWidgetItem(notification["title"]))
-            self.notifications_table.setItem(row, 2, QTableWidgetItem(notification["message"]))
+            # Cores da linha, escolhidas uma vez por notificação
+            bg = self._BG.get(notification["type"])
+            fg = self._FG_READ if notification["read"] else None
             
-            # Define a cor da linha com base no tipo de notificação
-            for col in range(3):
-                item = self.notifications_table.item(row, col)
-                if notification["type"] == "success":
-                    item.setBackground(QColor(200, 255, 200))  # Verde claro
-                elif notification["type"] == "warning":
-                    item.setBackground(QColor(255, 255, 200))  # Amarelo claro
-                elif notification["type"] == "error":
-                    item.setBackground(QColor(255, 200, 200))  # Vermelho claro
-                
-                # Texto em cinza para notificações lidas
-                if notification["read"]:
-                    item.setForeground(QColor(150, 150, 150))
+            # Adiciona os dados à tabela
+            for col, text in enumerate((timestamp, notification["title"], notification["message"])):
+                item = QTableWidgetItem(text)
+                if bg:
+                    item.setBackground(bg)
+                if fg:
+                    item.setForeground(fg)
+                self.notifications_table.setItem(row, col, item)
+        
+        self.notifications_table.setUpdatesEnabled(True)
     
     def mark_selected_as_read(self):
         """Marca as notificações selecionadas como lidas."""
-        selected_rows = set()
-        for item in self.notifications_table.selectedItems():
-            selected_rows.add(item.row())
+        # Uma entrada por linha selecionada (e não uma por célula)
+        selected_rows = [index.row() for index in self.notifications_table.selectionModel().selectedRows()]
         
+        # Atualiza apenas as linhas marcadas, sem refazer a tabela. A linha é
+        # associada à notificação exibida, e não a um índice do histórico, que
+        # muda quando as notificações mais antigas são descartadas
         for row in selected_rows:
-            self.notification_system.mark_as_read(row)
-        
-        self.refresh_notifications()
+            self.notification_system.mark_notification_as_read(self._row_notifications[row])
+            
+            for col in range(self.notifications_table.columnCount()):
+                self.notifications_table.item(row, col).setForeground(self._FG_READ)
     
     def clear_notifications(self):
         """Limpa todas as notificações."""
-        self.notification_system.notifications = []
+        self.notification_system.clear()
         self.refresh_notifications()
 
 class TelegramMonitorWidget(QWidget):
@@ -300,6 +397,9 @@ class TelegramMonitorWidget(QWidget):
     Widget para monitoramento em tempo real das apostas recebidas do Telegram.
     """
     
+    # Número máximo de linhas mantidas no feed (cerca de 50 apostas)
+    MAX_FEED_BLOCKS = 350
+    
     def __init__(self, notification_system=None, parent=None):
         super().__init__(parent)
         self.notification_system = notification_system
@@ -318,7 +418,7 @@ class TelegramMonitorWidget(QWidget):
         
         # Título
         title = QLabel("Apostas Recebidas do Telegram")
-        title.setFont(QFont("Arial", 12, QFont.Bold))
+        title.setFont(_title_font())
         layout.addWidget(title)
         
         # Área de texto para exibição das mensagens
@@ -335,8 +435,6 @@ class TelegramMonitorWidget(QWidget):
         Args:
             bet_data: Dados da aposta (objeto BetData ou dicionário).
         """
-        current_text = self.telegram_feed.toPlainText()
-        
         # Formata a mensagem com os dados da aposta
         now = datetime.now().strftime("%H:%M:%S")
         
@@ -361,8 +459,17 @@ class TelegramMonitorWidget(QWidget):
         new_message += f"Stake: {stake}\n"
         new_message += f"Tipo: {bet_type}\n\n"
         
-        # Adiciona a nova mensagem no topo
-        self.telegram_feed.setText(new_message + current_text)
+        # Adiciona a nova mensagem no topo, sem reconstruir o texto existente
+        document = self.telegram_feed.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText(new_message)
+        
+        # Descarta as mensagens mais antigas (no fim do feed)
+        if document.blockCount() > self.MAX_FEED_BLOCKS:
+            cursor.setPosition(document.findBlockByNumber(self.MAX_FEED_BLOCKS).position() - 1)
+            cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
         
         # Adiciona uma notificação
         if self.notification_system:
@@ -436,20 +543,91 @@ class TelegramMonitorWidget(QWidget):
                     "error"
                 )
 
+class BetsLoaderSignals(QObject):
+    """
+    Sinais emitidos pelo BetsLoader ao terminar a consulta.
+    """
+    
+    # Filtro usado na consulta e lista de apostas obtidas
+    loaded = pyqtSignal(str, list)
+    
+    # Mensagem de erro
+    failed = pyqtSignal(str)
+
+class BetsLoader(QRunnable):
+    """
+    Consulta as apostas do banco de dados em uma thread do QThreadPool,
+    sem bloquear a interface durante a requisição.
+    """
+    
+    def __init__(self, filter_type):
+        super().__init__()
+        self.filter_type = filter_type
+        self.signals = BetsLoaderSignals()
+    
+    def run(self):
+        """Executa a consulta e emite o resultado."""
+        try:
+            from ..database.supabase_client import get_supabase_client
+            import asyncio
+            
+            # Cria uma função assíncrona para obter as apostas
+            async def get_bets():
+                client = get_supabase_client()
+                
+                if self.filter_type == "all":
+                    return await client.get_all_bets()
+                elif self.filter_type == "success":
+                    return await client.get_bets_by_status("completed")
+                elif self.filter_type == "pending":
+                    return await client.get_bets_by_status("pending")
+                elif self.filter_type == "error":
+                    return await client.get_bets_by_status("failed")
+                else:
+                    return await client.get_all_bets()
+            
+            # Executa a função assíncrona no event loop desta thread
+            bets = asyncio.run(get_bets())
+            self.signals.loaded.emit(self.filter_type, list(bets or []))
+        
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
 class BetTrackingWidget(QWidget):
     """
     Widget para rastreamento de apostas processadas.
     """
     
+    # Cor de fundo da linha para cada status (criadas uma única vez)
+    _STATUS_COLORS = {
+        "completed": QColor(200, 255, 200),  # Verde claro
+        "pending": QColor(255, 255, 200),  # Amarelo claro
+        "failed": QColor(255, 200, 200)  # Vermelho claro
+    }
+    
+    # Intervalo da atualização periódica, em milissegundos
+    REFRESH_INTERVAL = 60000
+    
     def __init__(self, notification_system=None):
         super().__init__()
         self.notification_system = notification_system
+        
+        # Consulta em andamento (no máximo uma por vez)
+        self._loader = None
+        
+        # Últimas apostas exibidas (a tabela só é refeita se algo mudar)
+        self._displayed_bets = None
+        
+        # A última consulta falhou (o erro é notificado uma vez até a próxima consulta bem-sucedida)
+        self._load_failed = False
+        
         self.init_ui()
         
-        # Timer para atualizar o rastreamento de apostas
+        # As atualizações são disparadas pelas apostas recebidas (ver MainWindow);
+        # o timer só cobre mudanças de status e roda apenas com o widget visível
         self.update_timer = QTimer(self)
+        self.update_timer.setInterval(self.REFRESH_INTERVAL)
         self.update_timer.timeout.connect(self.update_bet_tracking)
-        self.update_timer.start(15000)  # Atualiza a cada 15 segundos
     
     def init_ui(self):
         """Inicializa a interface do widget de rastreamento de apostas."""
@@ -457,7 +635,7 @@ class BetTrackingWidget(QWidget):
         
         # Título
         title = QLabel("Rastreamento de Apostas")
-        title.setFont(QFont("Arial", 12, QFont.Bold))
+        title.setFont(_title_font())
         layout.addWidget(title)
         
         # Tabela de apostas
@@ -498,45 +676,80 @@ class BetTrackingWidget(QWidget):
         # Carrega as apostas iniciais
         self.update_bet_tracking()
     
+    def showEvent(self, event):
+        """Retoma a atualização periódica quando o widget fica visível."""
+        super().showEvent(event)
+        self.update_timer.start()
+    
+    def hideEvent(self, event):
+        """Suspende a atualização periódica enquanto o widget está oculto."""
+        super().hideEvent(event)
+        self.update_timer.stop()
+    
+    def on_bet_received(self, bet_data):
+        """
+        Atualiza o rastreamento quando uma nova aposta é recebida.
+        
+        Args:
+            bet_data: Dados da aposta (não utilizados; as apostas são relidas do banco).
+        """
+        self.update_bet_tracking()
+    
     def update_bet_tracking(self):
         """Atualiza o rastreamento de apostas."""
-        try:
-            # Obtém as apostas do banco de dados ou armazenamento local
-            from ..database.supabase_client import SupabaseClient
-            import asyncio
-            
-            # Cria uma função assíncrona para obter as apostas
-            async def get_bets():
-                client = SupabaseClient()
-                
-                if self.current_filter == "all":
-                    return await client.get_all_bets()
-                elif self.current_filter == "success":
-                    return await client.get_bets_by_status("completed")
-                elif self.current_filter == "pending":
-                    return await client.get_bets_by_status("pending")
-                elif self.current_filter == "error":
-                    return await client.get_bets_by_status("failed")
-                else:
-                    return await client.get_all_bets()
-            
-            # Executa a função assíncrona
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            bets = loop.run_until_complete(get_bets())
-            loop.close()
-            
-            # Atualiza a tabela
+        # A consulta ao banco de dados roda fora da thread da interface;
+        # se já houver uma em andamento, o resultado dela será usado
+        if self._loader:
+            return
+        
+        self._loader = BetsLoader(self.current_filter)
+        self._loader.signals.loaded.connect(self.on_bets_loaded)
+        self._loader.signals.failed.connect(self.on_bets_failed)
+        QThreadPool.globalInstance().start(self._loader)
+    
+    def on_bets_loaded(self, filter_type, bets):
+        """
+        Recebe as apostas consultadas pelo BetsLoader.
+        
+        Args:
+            filter_type: Filtro usado na consulta.
+            bets: Lista de apostas.
+        """
+        self._loader = None
+        self._load_failed = False
+        
+        # O filtro mudou durante a consulta: consulta novamente
+        if filter_type != self.current_filter:
+            self.update_bet_tracking()
+            return
+        
+        # Atualiza a tabela apenas se as apostas mudaram desde a última exibição
+        if bets != self._displayed_bets:
+            self._displayed_bets = bets
             self.update_table(bets)
+    
+    def on_bets_failed(self, message):
+        """
+        Recebe o erro da consulta feita pelo BetsLoader.
         
-        except Exception as e:
-            # Adiciona uma notificação de erro
-            if self.notification_system:
-                self.notification_system.add_notification(
-                    "Erro no Rastreamento",
-                    f"Erro ao atualizar rastreamento de apostas: {str(e)}",
-                    "error"
-                )
+        Args:
+            message: Mensagem de erro.
+        """
+        self._loader = None
+        
+        # As consultas são disparadas a cada aposta recebida: um erro persistente
+        # gera uma única notificação, e não uma janela de erro por consulta
+        if self._load_failed:
+            return
+        self._load_failed = True
+        
+        # Adiciona uma notificação de erro
+        if self.notification_system:
+            self.notification_system.add_notification(
+                "Erro no Rastreamento",
+                f"Erro ao atualizar rastreamento de apostas: {message}",
+                "error"
+            )
     
     def update_table(self, bets):
         """
@@ -545,47 +758,39 @@ class BetTrackingWidget(QWidget):
         Args:
             bets: Lista de apostas.
         """
-        # Limpa a tabela
+        # Preenche a tabela de uma vez, com uma única repintura ao final
+        self.bets_table.setUpdatesEnabled(False)
         self.bets_table.setRowCount(0)
+        self.bets_table.setRowCount(len(bets))
         
         # Adiciona as apostas à tabela
-        for bet in bets:
-            row = self.bets_table.rowCount()
-            self.bets_table.insertRow(row)
-            
+        for row, bet in enumerate(bets):
             # Formata a data/hora
             created_at = bet.get("created_at", "")
             if isinstance(created_at, str):
                 try:
-                    from datetime import datetime
                     dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
                     created_at = dt.strftime("%d/%m/%Y %H:%M:%S")
                 except:
                     pass
             
-            # Adiciona os dados à tabela
-            self.bets_table.setItem(row, 0, QTableWidgetItem(str(bet.get("id", ""))))
-            self.bets_table.setItem(row, 1, QTableWidgetItem(str(created_at)))
-            self.bets_table.setItem(row, 2, QTableWidgetItem(str(bet.get("race", ""))))
-            self.bets_table.setItem(row, 3, QTableWidgetItem(str(bet.get("horse_name", ""))))
-            self.bets_table.setItem(row, 4, QTableWidgetItem(str(bet.get("odds", ""))))
-            self.bets_table.setItem(row, 5, QTableWidgetItem(str(bet.get("stake", ""))))
-            self.bets_table.setItem(row, 6, QTableWidgetItem(str(bet.get("status", ""))))
-            
-            # Define a cor da linha com base no status
             status = bet.get("status", "")
-            color = None
+            values = (
+                bet.get("id", ""), created_at, bet.get("race", ""), bet.get("horse_name", ""),
+                bet.get("odds", ""), bet.get("stake", ""), status
+            )
             
-            if status == "completed":
-                color = QColor(200, 255, 200)  # Verde claro
-            elif status == "pending":
-                color = QColor(255, 255, 200)  # Amarelo claro
-            elif status == "failed":
-                color = QColor(255, 200, 200)  # Vermelho claro
+            # Cor da linha com base no status
+            color = self._STATUS_COLORS.get(status)
             
-            if color:
-                for col in range(7):
-                    self.bets_table.item(row, col).setBackground(color)
+            # Adiciona os dados à tabela, já com a cor da linha
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if color:
+                    item.setBackground(color)
+                self.bets_table.setItem(row, col, item)
+        
+        self.bets_table.setUpdatesEnabled(True)
     
     def filter_bets(self, filter_type):
         """
@@ -597,14 +802,74 @@ class BetTrackingWidget(QWidget):
         self.current_filter = filter_type
         self.update_bet_tracking()
 
+# Caminho do arquivo .env na raiz do projeto (resolvido uma única vez)
+_ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".env")
+
+# Modelo do arquivo .env gravado pelas configurações: os campos de SettingsWidget._FIELDS,
+# na ordem em que aparecem, seguidos da URL e da chave do Supabase e das configurações
+# do navegador que não estão no formulário (backend, intervalo entre apostas e workers)
+_ENV_TEMPLATE = """# Credenciais do Telegram
+TELEGRAM_API_ID={0}
+TELEGRAM_API_HASH={1}
+TELEGRAM_BOT_TOKEN={2}
+TELEGRAM_GROUP_ID={3}
+
+# Credenciais do Supabase
+SUPABASE_URL={11}
+SUPABASE_KEY={12}
+
+# Configurações de apostas
+DEFAULT_STAKE={4}
+MAX_STAKE={5}
+MIN_STAKE={6}
+
+# Configurações do navegador
+BROWSER_TYPE={7}
+BROWSER_BACKEND={13}
+HEADLESS={8}
+BET_INTERVAL={14}
+BROWSER_WORKERS={15}
+
+# Configurações da aplicação
+DEBUG_MODE={9}
+LOG_LEVEL={10}
+"""
+
 class SettingsWidget(QWidget):
     """
     Widget para configurações da aplicação.
     """
     
+    # Campos do formulário por seção da configuração: (atributo do widget, chave, valor padrão)
+    _FIELDS = (
+        ("telegram", (
+            ("api_id_input", "api_id", ""),
+            ("api_hash_input", "api_hash", ""),
+            ("bot_token_input", "bot_token", ""),
+            ("group_id_input", "group_id", "")
+        )),
+        ("betting", (
+            ("default_stake_input", "default_stake", 10),
+            ("max_stake_input", "max_stake", 100),
+            ("min_stake_input", "min_stake", 5)
+        )),
+        ("browser", (
+            ("browser_type_input", "type", "chrome"),
+            ("headless_input", "headless", False)
+        )),
+        ("app", (
+            ("debug_mode_input", "debug", False),
+            ("log_level_input", "log_level", "INFO")
+        ))
+    )
+    
     def __init__(self, notification_system=None):
         super().__init__()
         self.notification_system = notification_system
+        
+        # Últimos valores gravados no .env (evita regravar o arquivo sem alterações)
+        self._last_env_values = None
+        
         self.init_ui()
     
     def init_ui(self):
@@ -613,7 +878,7 @@ class SettingsWidget(QWidget):
         
         # Título
         title = QLabel("Configurações")
-        title.setFont(QFont("Arial", 12, QFont.Bold))
+        title.setFont(_title_font())
         layout.addWidget(title)
         
         # Formulário de configurações
@@ -624,6 +889,7 @@ class SettingsWidget(QWidget):
         telegram_layout = QFormLayout()
         
         self.api_id_input = QLineEdit()
+        self.api_id_input.setValidator(_positive_int_validator())
         self.api_hash_input = QLineEdit()
         self.bot_token_input = QLineEdit()
         self.group_id_input = QLineEdit()
@@ -721,24 +987,26 @@ class SettingsWidget(QWidget):
             
             config = get_config()
             
-            # Configurações do Telegram
-            self.api_id_input.setText(str(config["telegram"]["api_id"] or ""))
-            self.api_hash_input.setText(str(config["telegram"]["api_hash"] or ""))
-            self.bot_token_input.setText(str(config["telegram"]["bot_token"] or ""))
-            self.group_id_input.setText(str(config["telegram"]["group_id"] or ""))
+            # Preenche todos os campos de uma vez: sem sinais de alteração por campo
+            # e com uma única atualização da tela ao final
+            inputs = [getattr(self, attr) for _, fields in self._FIELDS for attr, _, _ in fields]
             
-            # Configurações de apostas
-            self.default_stake_input.setValue(float(config["betting"]["default_stake"] or 10))
-            self.max_stake_input.setValue(float(config["betting"]["max_stake"] or 100))
-            self.min_stake_input.setValue(float(config["betting"]["min_stake"] or 5))
+            self.setUpdatesEnabled(False)
+            for widget in inputs:
+                widget.blockSignals(True)
             
-            # Configurações do navegador
-            self.browser_type_input.setCurrentText(str(config["browser"]["type"] or "chrome"))
-            self.headless_input.setChecked(bool(config["browser"]["headless"]))
+            try:
+                for section, fields in self._FIELDS:
+                    # Cada seção é obtida uma única vez
+                    values = config[section]
+                    
+                    for attr, key, default in fields:
+                        self._set_field(getattr(self, attr), values[key], default)
             
-            # Configurações da aplicação
-            self.debug_mode_input.setChecked(bool(config["app"]["debug"]))
-            self.log_level_input.setCurrentText(str(config["app"]["log_level"] or "INFO"))
+            finally:
+                for widget in inputs:
+                    widget.blockSignals(False)
+                self.setUpdatesEnabled(True)
             
             # Adiciona uma notificação
             if self.notification_system:
@@ -757,44 +1025,86 @@ class SettingsWidget(QWidget):
                     "error"
                 )
     
+    @staticmethod
+    def _set_field(widget, value, default):
+        """
+        Preenche um campo do formulário de acordo com o tipo do widget.
+        
+        Args:
+            widget: Widget do campo.
+            value: Valor da configuração.
+            default: Valor usado se a configuração estiver vazia.
+        """
+        if isinstance(widget, QCheckBox):
+            widget.setChecked(bool(value))
+        elif isinstance(widget, QDoubleSpinBox):
+            widget.setValue(float(value or default))
+        elif isinstance(widget, QComboBox):
+            widget.setCurrentText(str(value or default))
+        else:
+            widget.setText(str(value or default))
+    
+    @staticmethod
+    def _field_value(widget):
+        """
+        Obtém o valor de um campo do formulário no formato gravado no .env.
+        
+        Args:
+            widget: Widget do campo.
+            
+        Returns:
+            Valor do campo.
+        """
+        if isinstance(widget, QCheckBox):
+            return "true" if widget.isChecked() else "false"
+        elif isinstance(widget, QDoubleSpinBox):
+            return widget.value()
+        elif isinstance(widget, QComboBox):
+            return widget.currentText()
+        else:
+            return widget.text()
+    
     def save_settings(self):
         """Salva as configurações no arquivo .env."""
         try:
-            import os
-            from dotenv import load_dotenv
+            from ..config.settings import get_config
             
-            # Carrega o arquivo .env atual
-            env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".env")
-            load_dotenv(env_path)
+            # As credenciais do Supabase e as configurações do navegador fora do formulário
+            # não são editadas aqui: mantém os valores já carregados na inicialização,
+            # sem reler e interpretar o .env a cada gravação
+            config = get_config()
+            supabase = config["supabase"]
+            browser = config["browser"]
             
             # Prepara as novas configurações
-            new_env = f"""# Credenciais do Telegram
-TELEGRAM_API_ID={self.api_id_input.text()}
-TELEGRAM_API_HASH={self.api_hash_input.text()}
-TELEGRAM_BOT_TOKEN={self.bot_token_input.text()}
-TELEGRAM_GROUP_ID={self.group_id_input.text()}
-
-# Credenciais do Supabase
-SUPABASE_URL={os.getenv("SUPABASE_URL", "sua_url_supabase")}
-SUPABASE_KEY={os.getenv("SUPABASE_KEY", "sua_chave_supabase")}
-
-# Configurações de apostas
-DEFAULT_STAKE={self.default_stake_input.value()}
-MAX_STAKE={self.max_stake_input.value()}
-MIN_STAKE={self.min_stake_input.value()}
-
-# Configurações do navegador
-BROWSER_TYPE={self.browser_type_input.currentText()}
-HEADLESS={"true" if self.headless_input.isChecked() else "false"}
-
-# Configurações da aplicação
-DEBUG_MODE={"true" if self.debug_mode_input.isChecked() else "false"}
-LOG_LEVEL={self.log_level_input.currentText()}
-"""
+            values = tuple(
+                self._field_value(getattr(self, attr))
+                for _, fields in self._FIELDS for attr, _, _ in fields
+            ) + (
+                supabase["url"] or "sua_url_supabase",
+                supabase["key"] or "sua_chave_supabase",
+                browser["backend"],
+                browser["bet_interval"],
+                browser["workers"]
+            )
             
-            # Salva as novas configurações
-            with open(env_path, "w") as f:
-                f.write(new_env)
+            # Salva as novas configurações apenas se mudaram desde a última gravação.
+            # O arquivo temporário (gravado em disco com um único fsync) + os.replace
+            # garante que o .env nunca fique parcialmente escrito, mesmo se a
+            # aplicação ou o sistema forem interrompidos no meio
+            if values != self._last_env_values:
+                tmp_path = f"{_ENV_PATH}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(_ENV_TEMPLATE.format(*values))
+                    f.flush()
+                    os.fsync(f.fileno())
+                
+                # Mantém as permissões do .env atual (ex.: 0600, já que contém credenciais)
+                if os.path.exists(_ENV_PATH):
+                    os.chmod(tmp_path, stat.S_IMODE(os.stat(_ENV_PATH).st_mode))
+                os.replace(tmp_path, _ENV_PATH)
+                
+                self._last_env_values = values
             
             # Adiciona uma notificação
             if self.notification_system:
@@ -839,29 +1149,35 @@ class MainWindow(QMainWindow):
         main_layout = QVBoxLayout(central_widget)
         
         # Cria as abas
-        tabs = QTabWidget()
+        self.tabs = QTabWidget()
         
         # Aba de Dashboard
         dashboard_tab = QWidget()
         dashboard_layout = QVBoxLayout(dashboard_tab)
         
         # Adiciona widgets à aba de Dashboard
-        dashboard_layout.addWidget(TelegramMonitorWidget(self.notification_system))
-        dashboard_layout.addWidget(BetTrackingWidget(self.notification_system))
-        
-        # Aba de Configurações
-        settings_tab = SettingsWidget(self.notification_system)
-        
-        # Aba de Notificações
-        notifications_tab = NotificationsWidget(self.notification_system)
-        
-        # Adiciona as abas ao widget de abas
-        tabs.addTab(dashboard_tab, "Dashboard")
-        tabs.addTab(settings_tab, "Configurações")
-        tabs.addTab(notifications_tab, "Notificações")
+        self.telegram_monitor = TelegramMonitorWidget(self.notification_system)
+        self.bet_tracking = BetTrackingWidget(self.notification_system)
+        dashboard_layout.addWidget(self.telegram_monitor)
+        dashboard_layout.addWidget(self.bet_tracking)
+        
+        # O rastreamento é atualizado a cada aposta recebida do Telegram
+        self.telegram_monitor.telegram_integration.bet_received.connect(self.bet_tracking.on_bet_received)
+        
+        # Adiciona as abas ao widget de abas. As abas de Configurações e de
+        # Notificações só são construídas na primeira vez em que são abertas
+        self.tabs.addTab(dashboard_tab, "Dashboard")
+        self.tabs.addTab(QWidget(), "Configurações")
+        self.tabs.addTab(QWidget(), "Notificações")
+        
+        self._tab_factories = {
+            1: lambda: SettingsWidget(self.notification_system),
+            2: lambda: NotificationsWidget(self.notification_system)
+        }
+        self.tabs.currentChanged.connect(self._materialize_tab)
         
         # Adiciona o widget de abas ao layout principal
-        main_layout.addWidget(tabs)
+        main_layout.addWidget(self.tabs)
         
         # Configura o tema
         app = QApplication.instance()
@@ -873,3 +1189,34 @@ class MainWindow(QMainWindow):
             "Bem-vindo ao RPA de Apostas Esportivas!",
             "info"
         )
+    
+    def _materialize_tab(self, index):
+        """
+        Constrói uma aba na primeira vez em que ela é aberta.
+        
+        Args:
+            index: Índice da aba selecionada.
+        """
+        factory = self._tab_factories.pop(index, None)
+        if factory is None:
+            return
+        
+        placeholder = self.tabs.widget(index)
+        title = self.tabs.tabText(index)
+        
+        # A aba é construída antes de entrar na janela (sem relayouts a cada
+        # widget adicionado); a troca é feita sem disparar currentChanged
+        # novamente e com a pintura suspensa, em uma única atualização
+        widget = factory()
+        
+        self.tabs.setUpdatesEnabled(False)
+        self.tabs.blockSignals(True)
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, widget, title)
+            self.tabs.setCurrentIndex(index)
+        finally:
+            self.tabs.blockSignals(False)
+            self.tabs.setUpdatesEnabled(True)
+        
+        placeholder.deleteLater()
@@ -14,11 +14,14 @@ from loguru import logger
 
 from config.settings import get_config
 from telegram.manager import TelegramManager, create_telegram_manager
-from database.supabase_client import SupabaseClient
+from database.supabase_client import get_supabase_client
 from database.schemas import Bet
 from browser.manager import get_browser_manager
 from gui.app import start_gui
 
+# Número de apostas pendentes obtidas do banco por consulta
+PENDING_BETS_BATCH_SIZE = 100
+
 
 class Application:
     """
@@ -30,7 +33,7 @@ class Application:
         Inicializa a aplicação.
         """
         self.config = get_config()
-        self.db_client = SupabaseClient()
+        self.db_client = get_supabase_client()
         self.telegram_manager = None
         self.browser_manager = get_browser_manager()
         self.running = False
@@ -94,8 +97,12 @@ class Application:
         try:
             # Converte para objeto Bet se for um dicionário
             if isinstance(bet_data, dict):
-                # Salva a aposta no banco de dados
-                saved_bet = await self.db_client.save_bet(bet_data)
+                # Salva a aposta no banco de dados junto com o log de entrada na fila
+                saved_bet = await self.db_client.save_bet_and_log(
+                    bet_data,
+                    "bet_queued",
+                    f"Aposta em {bet_data.get('horse_name')} na corrida {bet_data.get('race')} adicionada à fila"
+                )
                 
                 if saved_bet:
                     bet_id = saved_bet.get("id")
@@ -119,8 +126,12 @@ class Application:
                     created_at=bet_data.created_at
                 )
                 
-                # Salva a aposta no banco de dados
-                saved_bet = await self.db_client.save_bet(bet.to_dict())
+                # Salva a aposta no banco de dados junto com o log de entrada na fila
+                saved_bet = await self.db_client.save_bet_and_log(
+                    bet.to_dict(),
+                    "bet_queued",
+                    f"Aposta em {bet.horse_name} na corrida {bet.race} adicionada à fila"
+                )
                 
                 if saved_bet:
                     bet.id = saved_bet.get("id")
@@ -135,13 +146,6 @@ class Application:
             
             # Adiciona a aposta à fila do navegador
             self.browser_manager.add_bet_to_queue(bet)
-            
-            # Registra a ação no log
-            await self.db_client.log_action(
-                "bet_queued",
-                f"Aposta em {bet.horse_name} na corrida {bet.race} adicionada à fila",
-                bet.id
-            )
         
         except Exception as e:
             logger.error(f"Erro ao processar aposta: {e}")
@@ -151,29 +155,41 @@ class Application:
         Processa apostas pendentes do banco de dados.
         """
         try:
-            # Obtém apostas pendentes
-            pending_bets = await self.db_client.get_pending_bets()
+            queued_ids = set()
             
-            if pending_bets:
-                logger.info(f"Encontradas {len(pending_bets)} apostas pendentes.")
+            while True:
+                # Obtém o próximo lote de apostas pendentes
+                pending_bets = await self.db_client.get_pending_bets(PENDING_BETS_BATCH_SIZE)
+                
+                # Ignora apostas já enfileiradas (caso a atualização de status tenha falhado)
+                bets = [bet for bet in Bet.from_dicts(pending_bets) if bet.id not in queued_ids]
+                if not bets:
+                    break
+                
+                logger.info(f"Encontradas {len(bets)} apostas pendentes.")
                 
-                for bet_data in pending_bets:
-                    # Converte para objeto Bet
-                    bet = Bet.from_dict(bet_data)
+                # Atualiza o status do lote para "queued" (antes de enfileirar, para não
+                # sobrescrever o status "processing" definido pelos workers)
+                await self.db_client.update_bets_status([bet.id for bet in bets], "queued")
+                
+                for bet in bets:
+                    queued_ids.add(bet.id)
                     
                     # Adiciona à fila do navegador
                     self.browser_manager.add_bet_to_queue(bet)
                     
-                    # Atualiza o status para "queued"
-                    await self.db_client.update_bet_status(bet.id, "queued")
-                    
                     # Registra a ação no log
                     await self.db_client.log_action(
                         "bet_queued",
                         f"Aposta pendente em {bet.horse_name} na corrida {bet.race} adicionada à fila",
                         bet.id
                     )
-            else:
+                
+                # Um lote incompleto indica que não há mais apostas pendentes
+                if len(pending_bets) < PENDING_BETS_BATCH_SIZE:
+                    break
+            
+            if not queued_ids:
                 logger.info("Nenhuma aposta pendente encontrada.")
         
         except Exception as e:
@@ -247,6 +263,9 @@ class Application:
         if self.browser_manager:
             self.browser_manager.stop()
         
+        # Aguarda a gravação dos logs pendentes
+        self.db_client.flush()
+        
         # Para o event loop
         if self.event_loop:
             self.event_loop.call_soon_threadsafe(self.event_loop.stop)
@@ -265,9 +284,10 @@ def main():
         rotation="10 MB",
         retention="1 week",
         level="INFO",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        enqueue=True
     )
-    logger.add(sys.stderr, level="INFO")
+    logger.add(sys.stderr, level="INFO", enqueue=True)
     
     # Inicia a aplicação
     app = Application()
@@ -10,7 +10,7 @@ from loguru import logger
 
 from .monitor import TelegramMonitor
 from .parser import MessageParser, BetData
-from ..database.supabase_client import SupabaseClient
+from ..database.supabase_client import get_supabase_client
 
 
 class TelegramManager:
@@ -20,7 +20,7 @@ class TelegramManager:
     
     def __init__(self):
         """Inicializa o gerenciador do Telegram."""
-        self.db_client = SupabaseClient()
+        self.db_client = get_supabase_client()
         self.monitor = TelegramMonitor(self.db_client)
         self.bet_queue = asyncio.Queue()
         self.callbacks: List[Callable[[BetData], Awaitable[None]]] = []
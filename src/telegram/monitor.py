@@ -17,7 +17,7 @@ from ..config.settings import (
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_GROUP_ID,
 )
-from ..database.supabase_client import SupabaseClient
+from ..database.supabase_client import get_supabase_client
 
 
 class TelegramMonitor:
@@ -36,7 +36,7 @@ class TelegramMonitor:
         self.api_hash = TELEGRAM_API_HASH
         self.bot_token = TELEGRAM_BOT_TOKEN
         self.group_id = TELEGRAM_GROUP_ID
-        self.db_client = db_client or SupabaseClient()
+        self.db_client = db_client or get_supabase_client()
         self.client = None
         self.is_running = False
         self.bet_handlers = []
@@ -176,9 +176,9 @@ async def start_telegram_monitor(bet_queue=None):
     Returns:
         TelegramMonitor: Instância do monitor iniciado.
     """
-    from ..database.supabase_client import SupabaseClient
+    from ..database.supabase_client import get_supabase_client
     
-    db_client = SupabaseClient()
+    db_client = get_supabase_client()
     monitor = TelegramMonitor(db_client)
     
     if bet_queue:
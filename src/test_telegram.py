@@ -16,7 +16,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.config.settings import get_config
 from src.telegram.monitor import TelegramMonitor
 from src.telegram.parser import MessageParser, is_bet_message
-from src.database.supabase_client import SupabaseClient
+from src.database.supabase_client import get_supabase_client
 
 # Configura o logger
 logger.remove()
@@ -84,7 +84,7 @@ async def test_telegram_connection():
     logger.info("Credenciais do Telegram configuradas corretamente.")
     
     # Cria uma instância do monitor do Telegram
-    db_client = SupabaseClient()
+    db_client = get_supabase_client()
     monitor = TelegramMonitor(db_client)
     
     # Registra um handler para mensagens
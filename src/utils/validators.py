@@ -7,6 +7,11 @@ na interface gráfica do sistema de automação de apostas.
 import re
 from urllib.parse import urlparse
 
+# Expressões regulares compiladas uma única vez, na importação do módulo
+_API_KEY_PATTERN = re.compile(r'^[a-zA-Z0-9._-]+$')
+_TELEGRAM_API_HASH_PATTERN = re.compile(r'^[a-fA-F0-9]+$')
+_TELEGRAM_BOT_TOKEN_PATTERN = re.compile(r'^\d+:[a-zA-Z0-9_-]+$')
+
 
 def is_valid_url(url):
     """
@@ -42,7 +47,7 @@ def is_valid_api_key(key):
         return False
     
     # Verifica se a chave tem pelo menos 20 caracteres e contém apenas caracteres válidos
-    return len(key) >= 20 and bool(re.match(r'^[a-zA-Z0-9._-]+$', key))
+    return len(key) >= 20 and bool(_API_KEY_PATTERN.match(key))
 
 
 def is_valid_telegram_api_id(api_id):
@@ -80,7 +85,7 @@ def is_valid_telegram_api_hash(api_hash):
         return False
     
     # API Hash do Telegram é uma string hexadecimal de 32 caracteres
-    return len(api_hash) == 32 and bool(re.match(r'^[a-fA-F0-9]+$', api_hash))
+    return len(api_hash) == 32 and bool(_TELEGRAM_API_HASH_PATTERN.match(api_hash))
 
 
 def is_valid_telegram_bot_token(token):
@@ -97,7 +102,7 @@ def is_valid_telegram_bot_token(token):
         return False
     
     # Token de bot do Telegram segue o formato: 123456789:ABCDefGhIJKlmNoPQRsTUVwxyZ
-    return bool(re.match(r'^\d+:[a-zA-Z0-9_-]+$', token))
+    return bool(_TELEGRAM_BOT_TOKEN_PATTERN.match(token))
 
 
 def is_valid_telegram_group_id(group_id):